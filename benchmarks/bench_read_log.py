@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Throughput benchmark for reading the games.log file
+
+Replays a recorded games.log file with the former line by line reader, which
+checks the scheduler after every line, and with the chunked reader of LogTail,
+which checks the scheduler once per batch of lines.
+Without a given log file a burst of round end and map change lines is generated.
+
+Usage: python benchmarks/bench_read_log.py [<games.log>]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import lib.schedule as schedule
+from spunky import LogTail
+
+
+def generate_log(filename, rounds=2000, slots=32):
+    """
+    write a log file with bursts of lines as written at round end and map change
+    """
+    with open(filename, 'w') as file_handle:
+        for _ in xrange(rounds):
+            file_handle.write("  9:59 Exit: Timelimit hit.\n")
+            file_handle.write("  0:00 InitGame: \\g_matchmode\\0\\g_gametype\\7\\g_gear\\0\\mapname\\ut4_turnpike\\g_modversion\\4.3.4\n")
+            for num in xrange(slots):
+                file_handle.write("  0:00 ClientUserinfo: %d \\ip\\10.0.0.%d:27960\\name\\Player%d\\racered\\2\\raceblue\\2\\rate\\25000\\ut_timenudge\\0\\cg_rgb\\128 128 128\\funred\\ninja,caprd,jumpsuit\\cg_physics\\1\\snaps\\20\\gear\\GZJATWA\\authc\\0\\teamtask\\0\\cl_guid\\%032X\\weapmodes\\00000110220000020002\n" % (num, num, num, num))
+                file_handle.write("  0:00 ClientUserinfoChanged: %d n\\Player%d\\t\\%d\\r\\1\\tl\\0\\f0\\\\f1\\\\f2\\\\a0\\0\\a1\\0\\a2\\0\n" % (num, num, num % 2 + 1))
+                file_handle.write("  0:00 ClientBegin: %d\n" % num)
+            for num in xrange(slots):
+                file_handle.write("  0:05 Hit: %d %d 2 19: Player%d hit Player%d in the Helmet\n" % (num, (num + 1) % slots, (num + 1) % slots, num))
+                file_handle.write("  0:05 Kill: %d %d 19: Player%d killed Player%d by UT_MOD_M4\n" % ((num + 1) % slots, num, (num + 1) % slots, num))
+
+
+def new_scheduler():
+    """
+    create a scheduler with the regular jobs of the bot
+    """
+    scheduler = schedule.Scheduler()
+    scheduler.every(60).seconds.do(lambda: None)
+    scheduler.every(2).hours.do(lambda: None)
+    return scheduler
+
+
+def read_by_line(filename):
+    """
+    former reader: one readline() and one scheduler check per line
+    """
+    scheduler = new_scheduler()
+    counter = 0
+    with open(filename, 'r') as log_file:
+        while 1:
+            scheduler.run_pending()
+            line = log_file.readline()
+            if not line:
+                break
+            counter += 1
+    return counter
+
+
+def read_by_chunk(filename):
+    """
+    chunked reader: one scheduler check per batch of lines
+    """
+    scheduler = new_scheduler()
+    counter = 0
+    log_tail = LogTail(filename)
+    while 1:
+        lines = log_tail.read_lines()
+        scheduler.run_pending()
+        if not lines:
+            break
+        counter += len(lines)
+    return counter
+
+
+def run(name, func, filename):
+    """
+    run the reader and display the throughput
+    """
+    start = time.time()
+    counter = func(filename)
+    duration = time.time() - start
+    print("%-14s %9d lines in %7.3f s = %10.0f lines/s" % (name, counter, duration, counter / duration))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        LOG_FILE = sys.argv[1]
+    else:
+        LOG_FILE = os.path.join(tempfile.gettempdir(), 'spunkybot_bench_games.log')
+        generate_log(LOG_FILE)
+    print("Replaying %s (%d bytes)" % (LOG_FILE, os.path.getsize(LOG_FILE)))
+    run('readline', read_by_line, LOG_FILE)
+    run('chunked', read_by_chunk, LOG_FILE)
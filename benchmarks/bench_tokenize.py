@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for tokenizing the Kill and Hit lines of the games.log file
+
+Compares the former split() based field extraction with the precompiled
+patterns of lib/events.py over a synthetic corpus of Kill and Hit lines,
+and measures the complete tokenizer on the same corpus.
+
+Usage: python benchmarks/bench_tokenize.py [<number of lines>]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import lib.events as events
+
+
+def generate_corpus(num_lines, slots=32):
+    """
+    return a list of Kill and Hit lines, three hits per kill
+    """
+    corpus = []
+    append = corpus.append
+    for num in xrange(num_lines):
+        victim = num % slots
+        killer = (num + 7) % slots
+        if num % 4:
+            append("  3:%02d Hit: %d %d %d %d: Player%d hit Player%d in the Torso" % (num % 60, victim, killer, num % 15, 19, killer, victim))
+        else:
+            append("  3:%02d Kill: %d %d %d: Player%d killed Player%d by UT_MOD_M4" % (num % 60, killer, victim, 38, killer, victim))
+    return corpus
+
+
+def split_fields(line):
+    """
+    former extraction: split the action, then split the fields of the Kill and Hit line
+    """
+    tmp = line[7:].split(":", 1)
+    action = tmp[0].strip()
+    data = tmp[1].strip()
+    if action == 'Kill':
+        parts = data.split(":", 1)
+        info = parts[0].split()
+        return int(info[0]), int(info[1]), int(info[2]), parts[1].split()[0]
+    info = data.split(":", 1)[0].split()
+    return int(info[0]), int(info[1]), int(info[2]), int(info[3])
+
+
+def regex_fields(line):
+    """
+    new extraction: match the action and the fields in one pass with the precompiled patterns
+    """
+    numbers = events.NUMBERS
+    match = events.HIT_LINE_REO.match(line, 7)
+    if match is not None:
+        victim_id, hitter_id, hitpoint, hit_item = match.groups()
+        return numbers[victim_id], numbers[hitter_id], numbers[hitpoint], numbers[hit_item]
+    killer_id, victim_id, death_cause, killer_name = events.KILL_LINE_REO.match(line, 7).groups()
+    return numbers[killer_id], numbers[victim_id], numbers[death_cause], killer_name
+
+
+def measure(func, corpus):
+    """
+    return the time per line in nanoseconds
+    """
+    start = time.time()
+    for line in corpus:
+        func(line)
+    return (time.time() - start) * 1e9 / len(corpus)
+
+
+def main():
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    corpus = generate_corpus(num_lines)
+    assert [split_fields(line) for line in corpus[:100]] == [regex_fields(line) for line in corpus[:100]]
+    print "Corpus: %d Kill/Hit lines" % num_lines
+    for name, func in (('split() fields', split_fields), ('regex fields', regex_fields), ('events.tokenize', events.tokenize)):
+        print "%-16s: %7.0f ns/line" % (name, measure(func, corpus))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""
+Non-blocking Quake 3 client
+
+Sends RCON commands and status queries to one or more game servers without
+blocking the caller. Every request in flight uses its own UDP socket, so
+several requests can be pending at the same time and each reply belongs to
+the request of its socket. The caller waits for the sockets of the
+selectables() in its own select loop and calls ready(), which receives the
+replies, retransmits timed out requests with an increasing timeout and
+passes the result of each finished request to its callback.
+
+This file is part of Spunky Bot and released under the MIT License.
+"""
+
+import time
+import socket
+
+from lib.pyquake3 import parse_rcon_status
+
+PACKET_PREFIX = '\xff' * 4
+
+
+class Request(object):
+    """
+    pending request
+    """
+    __slots__ = ('address', 'packet', 'parse', 'callback', 'timeout', 'retries', 'deadline', 'header', 'payloads')
+
+    def __init__(self, address, packet, parse, callback, timeout, retries):
+        self.address = address
+        self.packet = packet
+        self.parse = parse
+        self.callback = callback
+        self.timeout = timeout
+        self.retries = retries
+        self.deadline = 0
+        self.header = None
+        self.payloads = []
+
+
+def parse_rcon(data):
+    """
+    return the response type and the response data of an RCON command
+    """
+    pos = data.index('\n')
+    response_type, response_data = data[len(PACKET_PREFIX):pos], data[pos + 1:]
+    if response_data in ('No rconpassword set on the server.\n', 'Bad rconpassword.\n'):
+        raise ValueError(response_data.strip())
+    return response_type, response_data
+
+
+def parse_getstatus(data):
+    """
+    return the server info of a getstatus response as dict
+    """
+    info = parse_rcon(data)[1].split('\n', 1)[0]
+    split = info[1:].split('\\')
+    return dict(zip(split[::2], split[1::2]))
+
+
+class AsyncQuake3(object):
+    """
+    AsyncQuake3 class
+    """
+    # time in seconds to wait for the next packet of a response which is split into several packets
+    quiet_period = 0.05
+    # factor of the timeout of each retransmission
+    backoff = 2
+
+    def __init__(self, max_in_flight=16):
+        """
+        create a new instance of AsyncQuake3
+
+        @param max_in_flight: Maximum number of pending requests, further requests are queued
+        @type  max_in_flight: Integer
+        """
+        self.max_in_flight = max_in_flight
+        self.pending = {}
+        self.queued = []
+
+    def rcon(self, server, rcon_password, cmd, callback, timeout=1, retries=3):
+        """
+        send RCON command, the callback gets the response type and data or None on failure
+        """
+        self.request(server, 'rcon "%s" %s' % (rcon_password, cmd), parse_rcon, callback, timeout, retries)
+
+    def getstatus(self, server, callback, timeout=1, retries=3):
+        """
+        get the server info, the callback gets a dict of the server info or None on failure
+        """
+        self.request(server, 'getstatus', parse_getstatus, callback, timeout, retries)
+
+    def rcon_status(self, server, rcon_password, callback, timeout=1, retries=3):
+        """
+        perform RCON status update, the callback gets a list of players or None on failure
+        """
+        self.request(server, 'rcon "%s" status' % rcon_password, lambda data: parse_rcon_status(parse_rcon(data)[1]), callback, timeout, retries)
+
+    def request(self, server, data, parse, callback, timeout, retries):
+        """
+        queue a request
+
+        @param server: The address of the game server, e.g. 127.0.0.1:27960
+        @type  server: String
+        @param data: The command without packet prefix
+        @type  data: String
+        @param parse: Function which returns the result of the response
+        @param callback: Function which is called with the result or None
+        @param timeout: Initial timeout in seconds
+        @type  timeout: Float
+        @param retries: Number of retransmissions
+        @type  retries: Integer
+        """
+        address, port = server.split(':')
+        request = Request((address, int(port)), '%s%s\n' % (PACKET_PREFIX, data), parse, callback, timeout, retries)
+        if len(self.pending) < self.max_in_flight:
+            self.send(request)
+        else:
+            self.queued.append(request)
+
+    def send(self, request):
+        """
+        send a request over a new socket
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(0)
+        sock.connect(request.address)
+        self.pending[sock] = request
+        self.transmit(sock, request)
+
+    def transmit(self, sock, request):
+        """
+        (re)transmit a request
+        """
+        request.deadline = time.time() + request.timeout
+        try:
+            sock.send(request.packet)
+        except socket.error:
+            # handled like a lost packet
+            pass
+
+    def selectables(self):
+        """
+        return the sockets of the pending requests
+        """
+        return self.pending.keys()
+
+    def next_timeout(self):
+        """
+        return the time in seconds until the next request times out or None if no request is pending
+        """
+        if not self.pending:
+            return None
+        return max(min(request.deadline for request in self.pending.itervalues()) - time.time(), 0)
+
+    def ready(self):
+        """
+        receive the replies, retransmit timed out requests and finish the completed requests
+        """
+        finished = []
+        for sock, request in self.pending.items():
+            while True:
+                try:
+                    data = sock.recv(8192)
+                except socket.error:
+                    break
+                header = data[:data.find('\n') + 1]
+                if not data.startswith(PACKET_PREFIX) or not header:
+                    continue
+                if request.header is None:
+                    request.header = header
+                    request.payloads.append(data)
+                elif header == request.header:
+                    request.payloads.append(data[len(header):])
+                else:
+                    continue
+                request.deadline = time.time() + self.quiet_period
+            if time.time() < request.deadline:
+                continue
+            if request.payloads:
+                finished.append((sock, request, ''.join(request.payloads)))
+            elif request.retries > 0:
+                request.retries -= 1
+                request.timeout *= self.backoff
+                self.transmit(sock, request)
+            else:
+                finished.append((sock, request, None))
+        for sock, request, data in finished:
+            del self.pending[sock]
+            sock.close()
+            while self.queued and len(self.pending) < self.max_in_flight:
+                self.send(self.queued.pop(0))
+        for sock, request, data in finished:
+            result = None
+            if data is not None:
+                try:
+                    result = request.parse(data)
+                except (IndexError, ValueError):
+                    pass
+            request.callback(result)
+
+    def close(self):
+        """
+        close the sockets of all pending requests
+        """
+        for sock in self.pending:
+            sock.close()
+        self.pending = {}
+        self.queued = []
@@ -0,0 +1,229 @@
+"""
+Typed events of the Urban Terror games.log file
+
+The tokenizer turns a raw line of the games.log file into a compact event
+object with pre-parsed fields. The events are consumed by the handlers of
+the log parser, but can also be queued, batched or passed to other consumers.
+
+This file is part of Spunky Bot and released under the MIT License.
+"""
+
+import re
+
+# Kill: <killer> <victim> <cause>: <killer name> killed <victim name> by <cause name>
+KILL_REO = re.compile(r'(\d+) (\d+) (\d+): (\S+)')
+KILL_LINE_REO = re.compile(r'Kill: (\d+) (\d+) (\d+): (\S+)')
+# Hit: <victim> <hitter> <zone> <weapon>: <hitter name> hit <victim name> in the <zone name>
+HIT_REO = re.compile(r'(\d+) (\d+) (\d+) (\d+):')
+HIT_LINE_REO = re.compile(r'Hit: (\d+) (\d+) (\d+) (\d+):')
+# white space in front of a separator of an info string
+TRAILING_SPACE_REO = re.compile(r'\s\\')
+# the numbers of Kill and Hit lines are below 1024, a lookup is much cheaper than int()
+NUMBERS = dict((str(num), num) for num in xrange(1024))
+
+
+def explode_line(line):
+    """
+    explode a backslash separated info string into a dict of key value pairs
+
+    @param line: The info string, e.g. \\name\\Player\\cl_guid\\1234
+    @type  line: String
+    """
+    arr = line.strip().lstrip('\\').split('\\')
+    if TRAILING_SPACE_REO.search(line):
+        # strip the trailing white space of each key and value
+        arr = [item.rstrip() for item in arr]
+    # pair the keys and values by slicing, a key without value is ignored
+    return dict(zip(arr[0::2], arr[1::2]))
+
+
+class LogEvent(object):
+    """
+    generic log event with the action and the remainder of the line
+    """
+    __slots__ = ('action', 'data')
+
+    def __init__(self, action, data):
+        """
+        create a new event
+
+        @param action: The action of the log line, e.g. 'Warmup'
+        @type  action: String
+        @param data: The remainder of the log line after the action
+        @type  data: String
+        """
+        self.action = action
+        self.data = data
+
+    def __repr__(self):
+        fields = [name for cls in reversed(type(self).__mro__) for name in getattr(cls, '__slots__', ())]
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % (name, getattr(self, name)) for name in fields))
+
+
+class PlayerEvent(LogEvent):
+    """
+    log event of a single player, e.g. ClientBegin: 0
+    """
+    __slots__ = ('player_num',)
+
+    def __init__(self, action, data):
+        LogEvent.__init__(self, action, data)
+        self.player_num = int(data.split(':', 1)[0].split(None, 1)[0])
+
+
+class FlagEvent(PlayerEvent):
+    """
+    flag event, e.g. Flag: 0 2: team_CTF_redflag
+    """
+    __slots__ = ('flag_action',)
+
+    def __init__(self, action, data):
+        PlayerEvent.__init__(self, action, data)
+        self.flag_action = int(data.split(':', 1)[0].split()[1])
+
+
+class KillEvent(LogEvent):
+    """
+    kill event, e.g. Kill: 0 1 19: Player0 killed Player1 by UT_MOD_LR300
+    """
+    __slots__ = ('killer_id', 'victim_id', 'death_cause', 'killer_name')
+
+    def __init__(self, action, data, match=None):
+        self.action = action
+        self.data = data
+        if match is None:
+            match = KILL_REO.match(data)
+            if match is None:
+                raise ValueError("Malformed Kill line: %s" % data)
+        killer_id, victim_id, death_cause, self.killer_name = match.groups()
+        try:
+            self.killer_id = NUMBERS[killer_id]
+            self.victim_id = NUMBERS[victim_id]
+            self.death_cause = NUMBERS[death_cause]
+        except KeyError:
+            self.killer_id = int(killer_id)
+            self.victim_id = int(victim_id)
+            self.death_cause = int(death_cause)
+
+
+class HitEvent(LogEvent):
+    """
+    hit event, e.g. Hit: 1 0 2 21: Player0 hit Player1 in the Torso
+    """
+    __slots__ = ('victim_id', 'hitter_id', 'hitpoint', 'hit_item')
+
+    def __init__(self, action, data, match=None):
+        self.action = action
+        self.data = data
+        if match is None:
+            match = HIT_REO.match(data)
+            if match is None:
+                raise ValueError("Malformed Hit line: %s" % data)
+        victim_id, hitter_id, hitpoint, hit_item = match.groups()
+        try:
+            self.victim_id = NUMBERS[victim_id]
+            self.hitter_id = NUMBERS[hitter_id]
+            self.hitpoint = NUMBERS[hitpoint]
+            self.hit_item = NUMBERS[hit_item]
+        except KeyError:
+            self.victim_id = int(victim_id)
+            self.hitter_id = int(hitter_id)
+            self.hitpoint = int(hitpoint)
+            self.hit_item = int(hit_item)
+
+
+class SayEvent(LogEvent):
+    """
+    chat event, e.g. say: 0 Player0: !help
+    player_num and name are None and command is empty if the line can not be parsed
+    """
+    __slots__ = ('player_num', 'name', 'text', 'command')
+
+    def __init__(self, action, data):
+        data = data.strip()
+        LogEvent.__init__(self, action, data)
+        divider = data.split(": ", 1)
+        sender = divider[0].split(" ", 1)
+        self.text = divider[1] if len(divider) > 1 else ''
+        self.name = sender[1] if len(sender) > 1 else None
+        words = self.text.split(None, 1)
+        self.command = words[0] if words else ''
+        try:
+            self.player_num = int(sender[0])
+        except ValueError:
+            self.player_num = None
+
+
+class UserinfoEvent(LogEvent):
+    """
+    user information event, e.g. ClientUserinfo: 0 \\name\\Player0\\cl_guid\\1234
+    the info string is decoded on demand, values and changed are None until then
+    """
+    __slots__ = ('player_num', 'info', 'values', 'changed')
+
+    def __init__(self, action, data):
+        LogEvent.__init__(self, action, data)
+        self.player_num = int(data[:2].strip())
+        self.info = data[2:]
+        self.values = None
+        self.changed = None
+
+    def decode(self, previous=None):
+        """
+        decode the info string and set the keys which changed since the previous values
+
+        @param previous: The decoded values of the previous line of the same player
+        @type  previous: dict
+        """
+        self.values = explode_line(self.info)
+        if previous is None:
+            self.changed = self.values
+        else:
+            self.changed = dict((key, value) for key, value in self.values.iteritems() if previous.get(key) != value)
+
+
+class InitGameEvent(LogEvent):
+    """
+    game start event with the server info, e.g. InitGame: \\g_gametype\\7\\mapname\\ut4_turnpike
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, action, data):
+        LogEvent.__init__(self, action, data)
+        self.values = explode_line(data)
+
+
+# event class of each action, all other actions create a generic LogEvent
+EVENT_TYPES = {'InitGame': InitGameEvent, 'say': SayEvent, 'sayteam': SayEvent, 'saytell': SayEvent,
+               'ClientUserinfo': UserinfoEvent, 'ClientUserinfoChanged': UserinfoEvent,
+               'ClientBegin': PlayerEvent, 'ClientDisconnect': PlayerEvent, 'ClientSpawn': PlayerEvent,
+               'Kill': KillEvent, 'Hit': HitEvent, 'Freeze': PlayerEvent, 'ThawOutFinished': PlayerEvent,
+               'Flag': FlagEvent, 'FlagCaptureTime': PlayerEvent}
+
+
+def tokenize(string, hit_match=HIT_LINE_REO.match, kill_match=KILL_LINE_REO.match):
+    """
+    turn a raw line of the games.log file into an event
+
+    @param string: The line of the log file including the time stamp
+    @type  string: String
+    @return: The event or None for an empty line
+    """
+    # fast path for the most frequent lines, all fields are extracted in one pass
+    match = hit_match(string, 7)
+    if match is not None:
+        return HitEvent('Hit', string[12:].strip(), match)
+    match = kill_match(string, 7)
+    if match is not None:
+        return KillEvent('Kill', string[13:].strip(), match)
+    tmp = string[7:].split(":", 1)
+    action = tmp[0].strip()
+    if not action:
+        return None
+    data = tmp[1].strip() if len(tmp) > 1 else action
+    if 'Bomb' in action and action not in EVENT_TYPES:
+        # e.g. 'Bomb was planted by 2' has no separator
+        return LogEvent('Bomb', data)
+    if 'Pop' in action and action not in EVENT_TYPES:
+        return LogEvent('Pop', data)
+    return EVENT_TYPES.get(action, LogEvent)(action, data)
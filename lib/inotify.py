@@ -0,0 +1,110 @@
+"""
+Minimal inotify binding for Linux using ctypes
+
+Only the small subset of the inotify API which is required to follow a single
+log file is implemented: create an instance, add or remove a watch and wait
+for events with an optional timeout.
+
+This file is part of Spunky Bot and released under the MIT License.
+"""
+
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# inotify event masks, see <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc():
+    """
+    load the C library and check for inotify support
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    if not hasattr(libc, 'inotify_init') or not hasattr(libc, 'inotify_add_watch'):
+        raise OSError(errno.ENOSYS, 'inotify is not supported on this platform')
+    return libc
+
+
+class Inotify(object):
+    """
+    Inotify instance
+    """
+    def __init__(self):
+        """
+        create a new inotify instance
+        """
+        try:
+            self.libc = _load_libc()
+        except (AttributeError, TypeError) as err:
+            raise OSError(errno.ENOSYS, 'inotify is not available: %s' % err)
+        self.fd = self.libc.inotify_init()
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def fileno(self):
+        """
+        return the file descriptor of the inotify instance
+        """
+        return self.fd
+
+    def add_watch(self, path, mask):
+        """
+        watch the given path for events in mask and return the watch descriptor
+        """
+        wd = self.libc.inotify_add_watch(self.fd, path, mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd):
+        """
+        remove the watch with the given watch descriptor
+        """
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout=None):
+        """
+        wait for events and return a list of tuples (wd, mask, cookie, name)
+
+        @param timeout: Maximum time to block in seconds, None blocks until an event arrives
+        @type  timeout: Float
+        """
+        try:
+            readable = select.select([self.fd], [], [], timeout)[0]
+        except select.error as err:
+            if err.args[0] == errno.EINTR:
+                return []
+            raise
+        if not readable:
+            return []
+        data = os.read(self.fd, 4096)
+        events = []
+        pos = 0
+        while pos + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip('\0')
+            pos += length
+            events.append((wd, mask, cookie, name))
+        return events
+
+    def close(self):
+        """
+        close the inotify instance
+        """
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
@@ -19,6 +19,7 @@ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """
 
 import socket
+import time
 import re
 
 
@@ -44,12 +45,34 @@ class Player(object):
         return str(self)
 
 
+def parse_rcon_status(data):
+    """
+    parse the response of the RCON command status and return a list of players
+    """
+    players = []
+    for ply in data.split('\n')[3:]:
+        ply = ply.split()
+        if not ply:
+            continue
+        try:
+            players.append(Player(int(ply[0]), ply[3], int(ply[1]), int(ply[2]), ply[5]))
+        except (IndexError, ValueError):
+            continue
+    return players
+
+
 class PyQuake3(object):
     """
     PyQuake3 class
     """
     packet_prefix = '\xff' * 4
     player_reo = re.compile(r'^(\d+) (\d+) "(.*)"')
+    # reply to a CVAR query, e.g. "g_logsync" is:"1^7" default:"0^7"
+    cvar_reo = re.compile(r'"([^"]+)" is:"(.*?)\^7"')
+    # maximum number of queries in flight, the game server limits the RCON requests per second
+    max_pipeline = 8
+    # time in seconds to wait for the next packet of a response which is split into several packets
+    quiet_period = 0.05
 
     rcon_password = None
     port = None
@@ -96,13 +119,27 @@ class PyQuake3(object):
 
     def recv(self, timeout=1):
         """
-        receive packets
+        receive packets, the payloads of a response which is split into several
+        packets are concatenated until no packet arrives within the quiet period
         """
         self.sock.settimeout(timeout)
         try:
-            return self.sock.recv(8192)
+            data = self.sock.recv(8192)
         except socket.error as err:
             raise Exception('Error receiving the packet: %s' % err[1])
+        header = data[:data.find('\n') + 1]
+        if not header:
+            return data
+        payloads = [data]
+        self.sock.settimeout(self.quiet_period)
+        while True:
+            try:
+                packet = self.sock.recv(8192)
+            except socket.error:
+                break
+            if packet.startswith(header):
+                payloads.append(packet[len(header):])
+        return ''.join(payloads)
 
     def command(self, cmd, timeout=1, retries=5):
         """
@@ -128,6 +165,34 @@ class PyQuake3(object):
             raise Exception(r_cmd[1][:-1])
         return r_cmd
 
+    def cvars(self, names, timeout=1, retries=2):
+        """
+        query several CVARs, the queries are sent back-to-back and the
+        replies are matched by the name of the CVAR
+        return a dict of the CVAR names and values, unanswered CVARs are missing
+        """
+        pending = dict((name.lower(), name) for name in names)
+        values = {}
+        while pending and retries:
+            queries = pending.values()
+            for pos in xrange(0, len(queries), self.max_pipeline):
+                for name in queries[pos:pos + self.max_pipeline]:
+                    self.send_packet('rcon "%s" %s' % (self.rcon_password, name))
+                deadline = time.time() + timeout
+                while pending and time.time() < deadline:
+                    self.sock.settimeout(deadline - time.time())
+                    try:
+                        data = self.sock.recv(8192)
+                    except socket.error:
+                        break
+                    if 'Bad rconpassword.' in data or 'No rconpassword set on the server.' in data:
+                        raise Exception(self.parse_packet(data)[1].strip())
+                    for name, value in self.cvar_reo.findall(data):
+                        if name.lower() in pending:
+                            values[pending.pop(name.lower())] = value
+            retries -= 1
+        return values
+
     def parse_packet(self, data):
         """
         parse the received packet
@@ -186,22 +251,7 @@ class PyQuake3(object):
         """
         status, data = self.rcon('status')
         if status == 'print' and data.startswith('map'):
-            lines = data.split('\n')
-
-            players = lines[3:]
-            self.players = []
-            for ply in players:
-                while ply.find('  ') != -1:
-                    ply = ply.replace('  ', ' ')
-                while ply.find(' ') == 0:
-                    ply = ply[1:]
-                if ply == '':
-                    continue
-                ply = ply.split(' ')
-                try:
-                    self.players.append(Player(int(ply[0]), ply[3], int(ply[1]), int(ply[2]), ply[5]))
-                except (IndexError, ValueError):
-                    continue
+            self.players = parse_rcon_status(data)
 
 
 if __name__ == '__main__':
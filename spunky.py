@@ -28,19 +28,28 @@ __version__ = '1.13.0'
 
 ### IMPORTS
 import os
+import io
 import time
+import mmap
+import select
+import socket
 import sqlite3
 import math
+import heapq
 import textwrap
 import random
+import argparse
 import ConfigParser
 import logging.handlers
-from Queue import Queue
+from Queue import PriorityQueue
 from threading import Thread
 from threading import RLock
 import lib.pygeoip as pygeoip
 import lib.schedule as schedule
+import lib.inotify as inotify
+import lib.events as events
 from lib.pyquake3 import PyQuake3
+from lib.asyncquake3 import AsyncQuake3
 
 
 # Get an instance of a logger
@@ -54,6 +63,33 @@ BOT_PLAYER_NUM = 1022
 # RCON Delay in seconds, recommended range: 0.18 - 0.33
 RCON_DELAY = 0.3
 
+# Priority classes of the RCON queue, lower values are sent first
+RCON_ENFORCE = 0
+RCON_REPLY = 1
+RCON_BROADCAST = 2
+
+# RCON commands which are always queued as enforcement
+RCON_ENFORCE_COMMANDS = ('kick', 'smite', 'slap', 'nuke', 'mute', 'forceteam')
+
+# RCON commands which are combined into a single packet with the command separator ';'
+RCON_COALESCE_COMMANDS = ('say', 'tell', 'bigtext')
+
+# Maximum length of combined RCON commands, the game server truncates an RCON packet to 1024 characters
+RCON_MAX_LENGTH = 900
+
+# Time to live in seconds of the cached server CVARs, CVARs which are not listed here are not cached
+CVAR_TTL = {'fs_homepath': 3600, 'fs_basepath': 3600, 'fs_game': 3600, 'g_mapcycle': 600,
+            'g_logsync': 600, 'g_loghits': 600, 'g_bombexplodetime': 600}
+
+# Poll interval in seconds for the games.log file, if inotify is not available
+LOG_POLL_DELAY = 0.125
+
+# Number of bytes read from the games.log file at once
+LOG_CHUNK_SIZE = 65536
+
+# Receive buffer size in bytes of the network log source
+LOG_RECV_BUFFER = 1048576
+
 COMMANDS = {'help': {'desc': 'display all available commands', 'syntax': '^7Usage: ^2!help', 'level': 0, 'short': 'h'},
             'forgive': {'desc': 'forgive a player for team killing', 'syntax': '^7Usage: ^2!forgive ^7[<name>]', 'level': 0, 'short': 'f'},
             'forgiveall': {'desc': 'forgive all team kills', 'syntax': '^7Usage: ^2!forgiveall', 'level': 0, 'short': 'fa'},
@@ -194,15 +230,368 @@ REASONS = {'obj': 'go for objective',
            'teams': 'keep the teams even'}
 
 
+### CLASS Log Tail ###
+class LogTail(object):
+    """
+    follow the game log file and wait for new lines
+    """
+    def __init__(self, filename, checkpoint_file=None, checkpoint_interval=0):
+        """
+        create a new instance of LogTail
+
+        @param filename: The full path of the games.log file
+        @type  filename: String
+        @param checkpoint_file: The file to store the read position
+        @type  checkpoint_file: String
+        @param checkpoint_interval: Number of processed lines between two checkpoints, 0 disables checkpoints
+        @type  checkpoint_interval: Integer
+        """
+        self.filename = filename
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
+        self.unsaved_lines = 0
+        self.missing = False
+        self.watch = None
+        self.log_file = io.open(filename, 'rb')
+        self.inode = os.fstat(self.log_file.fileno()).st_ino
+        # incomplete last line of the previous read
+        self.buffer = ''
+        # block on inotify events of the log file, fall back to polling
+        try:
+            self.inotify = inotify.Inotify()
+            self.watch_file()
+        except OSError as err:
+            self.inotify = None
+            logger.debug("inotify not available, polling the games.log file: %s", err)
+
+    def watch_file(self):
+        """
+        watch the currently opened log file for modifications, moves and deletion
+        """
+        if self.watch is not None:
+            self.inotify.rm_watch(self.watch)
+        self.watch = self.inotify.add_watch(self.filename, inotify.IN_MODIFY | inotify.IN_MOVE_SELF | inotify.IN_DELETE_SELF)
+
+    def read_lines(self):
+        """
+        read a chunk of the log file and return the list of complete lines
+        """
+        data = self.log_file.read(LOG_CHUNK_SIZE)
+        if not data:
+            # the old file has been read completely, check for rotation or truncation
+            if not self.check_rotation():
+                return []
+            # pass the incomplete last line of the old file and continue with the new one
+            lines = [self.buffer] if self.buffer else []
+            self.buffer = ''
+            return lines + self.read_lines()
+        lines = (self.buffer + data).split('\n')
+        # keep the partial trailing line for the next read
+        self.buffer = lines.pop()
+        return lines
+
+    def check_rotation(self):
+        """
+        reopen the log file if it has been rotated or go to the start if it has been truncated
+        """
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            # log file has been moved, the game server has not created the new one yet
+            self.missing = True
+            return False
+        self.missing = False
+        if stat.st_ino != self.inode:
+            logger.info("Gamelog file rotated  : %s", self.filename)
+            return self.reopen()
+        if stat.st_size < self.log_file.tell():
+            logger.info("Gamelog file truncated: %s", self.filename)
+            self.log_file.seek(0)
+            return True
+        return False
+
+    def reopen(self):
+        """
+        close the old log file and open the new one at its start
+        """
+        try:
+            log_file = io.open(self.filename, 'rb')
+        except IOError:
+            self.missing = True
+            return False
+        self.log_file.close()
+        self.log_file = log_file
+        self.inode = os.fstat(self.log_file.fileno()).st_ino
+        if self.inotify:
+            try:
+                self.watch_file()
+            except OSError as err:
+                logger.error(err)
+        return True
+
+    def seek(self, offset):
+        """
+        go to the given byte offset of the log file and discard the buffered partial line
+        """
+        self.log_file.seek(offset)
+        self.buffer = ''
+
+    def tell(self):
+        """
+        return the byte offset of the first line which has not been processed yet
+        """
+        return self.log_file.tell() - len(self.buffer)
+
+    def resume(self):
+        """
+        go to the position of the last checkpoint or to the end of the log file
+        """
+        offset = None
+        if self.checkpoint_file and os.path.isfile(self.checkpoint_file):
+            try:
+                with open(self.checkpoint_file, 'r') as file_handle:
+                    inode, offset = [int(value) for value in file_handle.read().split()]
+            except (IOError, ValueError):
+                inode = offset = None
+            # ignore checkpoint of a rotated or truncated log file
+            if inode != self.inode or offset > os.fstat(self.log_file.fileno()).st_size:
+                offset = None
+        if offset is None:
+            self.log_file.seek(0, 2)
+            self.buffer = ''
+        else:
+            self.seek(offset)
+            logger.info("Resume Gamelog file at: byte %d", offset)
+        return self.tell()
+
+    def checkpoint(self, num_lines):
+        """
+        count the processed lines and store the read position every checkpoint_interval lines
+
+        @param num_lines: The number of lines which have been processed
+        @type  num_lines: Integer
+        """
+        if not self.checkpoint_file or self.checkpoint_interval <= 0:
+            return
+        self.unsaved_lines += num_lines
+        if self.unsaved_lines >= self.checkpoint_interval:
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """
+        store inode and read position of the log file
+        """
+        tmp_file = "%s.tmp" % self.checkpoint_file
+        try:
+            with open(tmp_file, 'w') as file_handle:
+                file_handle.write("%d %d\n" % (self.inode, self.tell()))
+            os.rename(tmp_file, self.checkpoint_file)
+        except (IOError, OSError) as err:
+            logger.error("ERROR: Cannot write checkpoint file: %s", err)
+        self.unsaved_lines = 0
+
+    def find_last_action(self, action, end):
+        """
+        search backwards in a memory map of the log file for the last line of the given action
+
+        @param action: The action of the line, e.g. 'InitGame:'
+        @type  action: String
+        @param end: The byte offset to start the backward search
+        @type  end: Integer
+        @return: The line or None if no line has been found
+        """
+        try:
+            log_map = mmap.mmap(self.log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # empty file
+            return None
+        try:
+            pos = end
+            while 1:
+                pos = log_map.rfind(action, 0, pos)
+                if pos < 0:
+                    return None
+                line_start = log_map.rfind('\n', 0, pos) + 1
+                line_end = log_map.find('\n', pos)
+                line = log_map[line_start:line_end if line_end >= 0 else end]
+                # skip the action in other lines, e.g. in chat messages
+                tmp = line.split(None, 2)
+                if len(tmp) > 1 and tmp[1] == action:
+                    return line
+        finally:
+            log_map.close()
+
+    def wait(self, timeout):
+        """
+        wait until the log file has been modified or the timeout expired
+
+        @param timeout: Maximum time to wait in seconds
+        @type  timeout: Float
+        """
+        timeout = max(timeout, 0)
+        if self.inotify and not self.missing:
+            self.inotify.read_events(timeout)
+        else:
+            time.sleep(min(timeout, LOG_POLL_DELAY))
+
+    def selectables(self):
+        """
+        return the objects to select on for new lines or None if the log file must be polled
+        """
+        if self.inotify and not self.missing:
+            return [self.inotify]
+        return None
+
+    def ready(self):
+        """
+        drain the pending inotify events after the select returned
+        """
+        self.inotify.read_events(0)
+
+
+### CLASS Network Log ###
+class NetworkLog(object):
+    """
+    receive the lines of the games.log file from a log shipper over UDP or TCP
+    """
+    def __init__(self, source):
+        """
+        create a new instance of NetworkLog and listen on the given address
+
+        @param source: The address to listen on, udp://address:port or tcp://address:port
+        @type  source: String
+        """
+        try:
+            protocol, address = source.split('://', 1)
+            host, port = address.rsplit(':', 1)
+            port = int(port)
+        except ValueError:
+            raise ValueError("Log source format must be: udp://address:port or tcp://address:port")
+        self.protocol = protocol.lower()
+        if self.protocol == 'udp':
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # room for the bursts of lines at round end and map change
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, LOG_RECV_BUFFER)
+        elif self.protocol == 'tcp':
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        else:
+            raise ValueError("Log source protocol must be udp or tcp")
+        self.sock.bind((host, port))
+        if self.protocol == 'tcp':
+            self.sock.listen(5)
+        self.sock.setblocking(0)
+        # partial line of each sender, TCP connection or UDP address
+        self.buffers = {}
+        self.connections = []
+
+    def read_lines(self):
+        """
+        return the complete lines received since the last call
+        """
+        received = 0
+        if self.protocol == 'udp':
+            while received < LOG_CHUNK_SIZE:
+                try:
+                    data, address = self.sock.recvfrom(65535)
+                except socket.error:
+                    break
+                received += len(data)
+                self.buffers[address] = self.buffers.get(address, '') + data
+        else:
+            while 1:
+                try:
+                    connection = self.sock.accept()[0]
+                except socket.error:
+                    break
+                connection.setblocking(0)
+                self.connections.append(connection)
+                self.buffers[connection] = ''
+            for connection in list(self.connections):
+                try:
+                    data = connection.recv(LOG_CHUNK_SIZE)
+                except socket.error:
+                    continue
+                if not data:
+                    # log shipper closed the connection
+                    connection.close()
+                    self.connections.remove(connection)
+                    del self.buffers[connection]
+                    continue
+                self.buffers[connection] += data
+        lines = []
+        for sender, data in self.buffers.iteritems():
+            if '\n' in data:
+                complete, self.buffers[sender] = data.rsplit('\n', 1)
+                lines.extend(line.rstrip('\r') for line in complete.split('\n') if line)
+        return lines
+
+    def wait(self, timeout):
+        """
+        wait until new data has been received or the timeout expired
+
+        @param timeout: Maximum time to wait in seconds
+        @type  timeout: Float
+        """
+        try:
+            select.select(self.selectables(), [], [], max(timeout, 0))
+        except select.error:
+            pass
+
+    def selectables(self):
+        """
+        return the sockets to select on for new lines
+        """
+        return [self.sock] + self.connections
+
+    def ready(self):
+        """
+        nothing to drain, the data is read by read_lines
+        """
+        pass
+
+    def tell(self):
+        """
+        a network log has no read position
+        """
+        return 0
+
+    def resume(self):
+        """
+        a network log always starts with the next received line
+        """
+        pass
+
+    def checkpoint(self, num_lines):
+        """
+        a network log has no read position to save
+        """
+        pass
+
+    def find_last_action(self, action, end):
+        """
+        the lines before the start of the bot are not available
+        """
+        return None
+
+
 ### CLASS Log Parser ###
 class LogParser(object):
     """
     log file parser
     """
-    def __init__(self):
+    def __init__(self, section='server', replay_file=None, rcon_client=None):
         """
         create a new instance of LogParser
+
+        @param section: The section of the game server in the config file, 'server' or 'server:NAME'
+        @type  section: String
+        @param replay_file: Feed the given recorded games.log file through the parser instead of following the live log
+        @type  replay_file: String
+        @param rcon_client: Non-blocking client for the periodic status queries, shared by all game servers
+        @type  rcon_client: Instance
         """
+        self.rcon_client = rcon_client
         # hit zone support for UrT > 4.2.013
         self.hit_points = {0: "HEAD", 1: "HEAD", 2: "HELMET", 3: "TORSO", 4: "VEST", 5: "LEFT_ARM", 6: "RIGHT_ARM",
                            7: "GROIN", 8: "BUTT", 9: "LEFT_UPPER_LEG", 10: "RIGHT_UPPER_LEG", 11: "LEFT_LOWER_LEG",
@@ -219,6 +608,22 @@ class LogParser(object):
                             31: "UT_MOD_SPLODED", 32: "UT_MOD_SLAPPED", 33: "UT_MOD_SMITED", 34: "UT_MOD_BOMBED",
                             35: "UT_MOD_NUKED", 36: "UT_MOD_NEGEV", 37: "UT_MOD_HK69_HIT", 38: "UT_MOD_M4",
                             39: "UT_MOD_GLOCK", 40: "UT_MOD_COLT1911", 41: "UT_MOD_MAC11"}
+        # hit zones of the hit statistics
+        self.hit_zones = {'TORSO': 'body', 'VEST': 'body', 'KEVLAR': 'body', 'BUTT': 'body', 'GROIN': 'body',
+                          'LEGS': 'legs', 'LEFT_UPPER_LEG': 'legs', 'RIGHT_UPPER_LEG': 'legs',
+                          'LEFT_LOWER_LEG': 'legs', 'RIGHT_LOWER_LEG': 'legs', 'LEFT_FOOT': 'legs', 'RIGHT_FOOT': 'legs',
+                          'ARMS': 'arms', 'LEFT_ARM': 'arms', 'RIGHT_ARM': 'arms'}
+        self.suicide_reason = ('UT_MOD_SUICIDE', 'MOD_FALLING', 'MOD_WATER', 'MOD_LAVA', 'MOD_TRIGGER_HURT',
+                               'UT_MOD_SPLODED', 'UT_MOD_SLAPPED', 'UT_MOD_SMITED')
+        self.suicide_weapon = ('UT_MOD_HEGRENADE', 'UT_MOD_HK69', 'UT_MOD_NUKED', 'UT_MOD_BOMBED')
+        # messages of headshot, kill and killing spree series
+        self.hs_msg = {5: 'watch out!', 10: 'awesome!', 15: 'unbelievable!', 20: '^1MANIAC!', 25: '^2AIMBOT?',
+                       30: 'stop that', 35: 'stop that ^5NOW', 40: '^6OMG ^7stop it', 45: 'no mercy', 50: '^2HEAD RIPPER'}
+        self.event_series_msg = {5: 'go on!', 10: 'beware!', 15: 'eat that!', 20: 'got pwned!', 25: 'impressive!', 30: 'dominating!'}
+        self.kill_streak_msg = {5: "is on a killing spree (^15 ^7kills in a row)",
+                                10: "is on a rampage (^110 ^7kills in a row)",
+                                15: "is unstoppable (^115 ^7kills in a row)",
+                                20: "is godlike (^120 ^7kills in a row)"}
 
         # RCON commands for the different admin roles
         self.user_cmds = []
@@ -270,7 +675,13 @@ class LogParser(object):
         self.superadmin_cmds.sort()
 
         logger.info("Starting logging      : OK")
-        games_log = CONFIG.get('server', 'log_file')
+        self.section = section
+        # game log received over the network or read from the local file
+        log_source = CONFIG.get(section, 'log_source') if CONFIG.has_option(section, 'log_source') else None
+        games_log = CONFIG.get(section, 'log_file') if not log_source else None
+        checkpoint_interval = CONFIG.getint(section, 'checkpoint_interval') if CONFIG.has_option(section, 'checkpoint_interval') else 100
+        # read position of the games.log file, one file per game server
+        checkpoint_file = os.path.join(HOME, 'games.pos' if section == 'server' else 'games-%s.pos' % section.split(':', 1)[1])
 
         self.ffa_lms_gametype = False
         self.ctf_gametype = False
@@ -282,6 +693,7 @@ class LogParser(object):
         self.allow_cmd_teams = True
         self.urt_modversion = None
         self.game = None
+        self.log_source = None
         self.players_lock = RLock()
         self.firstblood = False
         self.firstnadekill = False
@@ -292,6 +704,8 @@ class LogParser(object):
         self.allow_nextmap_vote = True
         self.failed_vote_timer = 0
         self.last_vote = ''
+        # last user information line and decoded values of each player slot
+        self.userinfo_cache = {}
         self.default_gear = ''
 
         # enable/disable autokick for team killing
@@ -343,6 +757,11 @@ class LogParser(object):
         logger.info("Connecting to Database: OK")
         logger.debug("Cmd !iamgod available : %s", self.iamgod)
         self.uptime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time()))
+        # handler of each log event action
+        self.dispatch = self.get_dispatch_table()
+        if replay_file:
+            self.replay(replay_file)
+            return
         # Rotating Messages and Rules
         if CONFIG.has_option('rules', 'show_rules') and CONFIG.getboolean('rules', 'show_rules'):
             self.output_rules = CONFIG.get('rules', 'display') if CONFIG.has_option('rules', 'display') else "chat"
@@ -355,18 +774,24 @@ class LogParser(object):
             else:
                 logger.error("ERROR: Rotating messages will be ignored, file '%s' has not been found", self.rules_file)
         # Parse Game log file
-        try:
-            # open game log file
-            self.log_file = open(games_log, 'r')
-        except IOError:
-            logger.error("ERROR: The Gamelog file '%s' has not been found", games_log)
-            logger.error("*** Aborting Spunky Bot ***")
+        if log_source:
+            try:
+                # receive the lines of the game log over the network
+                self.log_source = NetworkLog(log_source)
+            except (ValueError, socket.error) as err:
+                logger.error("ERROR: Cannot listen on the log source '%s': %s", log_source, err)
+            else:
+                logger.info("Receiving Gamelog from: %s", log_source)
         else:
-            # go to the end of the file
-            self.log_file.seek(0, 2)
-            # start parsing the games logfile
-            logger.info("Parsing Gamelog file  : %s", games_log)
-            self.read_log()
+            try:
+                # open game log file
+                self.log_source = LogTail(games_log, checkpoint_file, checkpoint_interval)
+            except IOError:
+                logger.error("ERROR: The Gamelog file '%s' has not been found", games_log)
+            else:
+                # go to the last checkpoint or to the end of the file
+                self.log_source.resume()
+                logger.info("Parsing Gamelog file  : %s", games_log)
 
     def thread_rotate(self):
         """
@@ -391,102 +816,110 @@ class LogParser(object):
                 # display rule
                 with self.players_lock:
                     if "@admins" in line:
-                        self.game.rcon_say(self.get_admins_online())
+                        self.game.rcon_say(self.get_admins_online(), priority=RCON_BROADCAST)
                     elif "@admincount" in line:
-                        self.game.rcon_say(self.get_admin_count())
+                        self.game.rcon_say(self.get_admin_count(), priority=RCON_BROADCAST)
                     elif "@nextmap" in line:
-                        self.game.rcon_say(self.get_nextmap())
+                        self.game.rcon_say(self.get_nextmap(), priority=RCON_BROADCAST)
                     elif "@time" in line:
-                        self.game.rcon_say("^7Time: %s" % time.strftime("%H:%M", time.localtime(time.time())))
+                        self.game.rcon_say("^7Time: %s" % time.strftime("%H:%M", time.localtime(time.time())), priority=RCON_BROADCAST)
                     elif "@bigtext" in line:
                         self.game.rcon_bigtext("^7%s" % line.split('@bigtext')[-1].strip())
                     else:
                         if self.output_rules == 'chat':
-                            self.game.rcon_say("^2%s" % line.strip())
+                            self.game.rcon_say("^2%s" % line.strip(), priority=RCON_BROADCAST)
                         elif self.output_rules == 'bigtext':
                             self.game.rcon_bigtext("^2%s" % line.strip())
                         else:
-                            self.game.send_rcon("^2%s" % line.strip())
+                            self.game.send_rcon("^2%s" % line.strip(), priority=RCON_BROADCAST)
                 # wait for given delay in the config file
                 time.sleep(self.rules_frequency)
 
     def find_game_start(self):
         """
-        find InitGame start
+        find the last InitGame line before the current read position and set modversion, game type and gear
+
+        @return: The server info of the InitGame line
+        @rtype: dict
         """
-        seek_amount = 768
-        # search within the specified range for the InitGame message
-        start_pos = self.log_file.tell() - seek_amount
-        end_pos = start_pos + seek_amount
-        try:
-            self.log_file.seek(start_pos)
-        except IOError:
-            logger.error("ERROR: The games.log file is empty, ignoring game type and start")
-            # go to the end of the file
-            self.log_file.seek(0, 2)
-            game_start = True
+        line = self.log_source.find_last_action('InitGame:', self.log_source.tell())
+        if line is not None:
+            values = self.explode_line(line.split('InitGame:', 1)[1])
         else:
-            game_start = False
-        while not game_start:
-            while self.log_file:
-                line = self.log_file.readline()
-                tmp = line.split()
-                if len(tmp) > 1 and tmp[1] == "InitGame:":
-                    game_start = True
-                    if 'g_modversion\\4.3' in line:
-                        self.hit_item.update({23: "UT_MOD_FRF1", 24: "UT_MOD_BENELLI", 25: "UT_MOD_P90",
-                                              26: "UT_MOD_MAGNUM", 29: "UT_MOD_KICKED", 30: "UT_MOD_KNIFE_THROWN"})
-                        self.death_cause.update({42: "UT_MOD_FRF1", 43: "UT_MOD_BENELLI", 44: "UT_MOD_P90", 45: "UT_MOD_MAGNUM",
-                                                 46: "UT_MOD_TOD50", 47: "UT_MOD_FLAG", 48: "UT_MOD_GOOMBA"})
-                        self.urt_modversion = 43
-                        logger.info("Game modversion       : 4.3")
-                    elif 'g_modversion\\4.2' in line:
-                        self.hit_item.update({23: "UT_MOD_BLED", 24: "UT_MOD_KICKED", 25: "UT_MOD_KNIFE_THROWN"})
-                        self.death_cause.update({42: "UT_MOD_FLAG", 43: "UT_MOD_GOOMBA"})
-                        self.urt_modversion = 42
-                        logger.info("Game modversion       : 4.2")
-                    elif 'g_modversion\\4.1' in line:
-                        # hit zone support for UrT 4.1
-                        self.hit_points = {0: "HEAD", 1: "HELMET", 2: "TORSO", 3: "KEVLAR", 4: "ARMS", 5: "LEGS", 6: "BODY"}
-                        self.hit_item.update({21: "UT_MOD_KICKED", 22: "UT_MOD_KNIFE_THROWN"})
-                        self.death_cause.update({33: "UT_MOD_BOMBED", 34: "UT_MOD_NUKED", 35: "UT_MOD_NEGEV",
-                                                 39: "UT_MOD_FLAG", 40: "UT_MOD_GOOMBA"})
-                        self.urt_modversion = 41
-                        logger.info("Game modversion       : 4.1")
-
-                    if 'g_gametype\\0\\' in line or 'g_gametype\\1\\' in line or 'g_gametype\\9\\' in line or 'g_gametype\\11\\' in line:
-                        # disable teamkill event and some commands for FFA (0), LMS (1), Jump (9), Gun (11)
-                        self.ffa_lms_gametype = True
-                    elif 'g_gametype\\7\\' in line:
-                        self.ctf_gametype = True
-                    elif 'g_gametype\\4\\' in line or 'g_gametype\\5\\' in line:
-                        self.ts_gametype = True
-                    elif 'g_gametype\\3\\' in line:
-                        self.tdm_gametype = True
-                    elif 'g_gametype\\8\\' in line:
-                        self.bomb_gametype = True
-                    elif 'g_gametype\\10\\' in line:
-                        self.freeze_gametype = True
-
-                    # get default g_gear value
-                    self.default_gear = line.split('g_gear\\')[-1].split('\\')[0] if 'g_gear\\' in line else "%s" % '' if self.urt_modversion > 41 else '0'
-
-                if self.log_file.tell() > end_pos:
-                    break
-                elif not line:
-                    break
-            if self.log_file.tell() < seek_amount:
-                self.log_file.seek(0, 0)
-            else:
-                cur_pos = start_pos - seek_amount
-                end_pos = start_pos
-                start_pos = cur_pos
-                start_pos = max(start_pos, 0)
-                self.log_file.seek(start_pos)
+            # no game start in the log, ask the game server
+            values = self.get_server_info()
+            if not values:
+                logger.error("ERROR: No game start found in the games.log file, ignoring game type and start")
+                return {}
+        self.set_game_info(values)
+        return values
 
-    def read_log(self):
+    def get_server_info(self):
         """
-        read the logfile
+        return the server info of the running game, queried with getstatus
+        """
+        try:
+            quake = PyQuake3("%s:%s" % (CONFIG.get(self.section, 'server_ip'), CONFIG.get(self.section, 'server_port')))
+            try:
+                quake.update()
+            finally:
+                quake.sock.close()
+        except Exception as err:
+            logger.error("ERROR: Cannot get the server info: %s", err)
+            return {}
+        logger.info("Game server info      : %s:%s", quake.address, quake.port)
+        return quake.values
+
+    def set_game_info(self, values):
+        """
+        set modversion, game type and default gear from the server info of the InitGame line
+
+        @param values: The server info of the InitGame line
+        @type  values: dict
+        """
+        modversion = values.get('g_modversion', '')
+        gametype = values.get('g_gametype')
+        if modversion.startswith('4.3'):
+            self.hit_item.update({23: "UT_MOD_FRF1", 24: "UT_MOD_BENELLI", 25: "UT_MOD_P90",
+                                  26: "UT_MOD_MAGNUM", 29: "UT_MOD_KICKED", 30: "UT_MOD_KNIFE_THROWN"})
+            self.death_cause.update({42: "UT_MOD_FRF1", 43: "UT_MOD_BENELLI", 44: "UT_MOD_P90", 45: "UT_MOD_MAGNUM",
+                                     46: "UT_MOD_TOD50", 47: "UT_MOD_FLAG", 48: "UT_MOD_GOOMBA"})
+            self.urt_modversion = 43
+            logger.info("Game modversion       : 4.3")
+        elif modversion.startswith('4.2'):
+            self.hit_item.update({23: "UT_MOD_BLED", 24: "UT_MOD_KICKED", 25: "UT_MOD_KNIFE_THROWN"})
+            self.death_cause.update({42: "UT_MOD_FLAG", 43: "UT_MOD_GOOMBA"})
+            self.urt_modversion = 42
+            logger.info("Game modversion       : 4.2")
+        elif modversion.startswith('4.1'):
+            # hit zone support for UrT 4.1
+            self.hit_points = {0: "HEAD", 1: "HELMET", 2: "TORSO", 3: "KEVLAR", 4: "ARMS", 5: "LEGS", 6: "BODY"}
+            self.hit_item.update({21: "UT_MOD_KICKED", 22: "UT_MOD_KNIFE_THROWN"})
+            self.death_cause.update({33: "UT_MOD_BOMBED", 34: "UT_MOD_NUKED", 35: "UT_MOD_NEGEV",
+                                     39: "UT_MOD_FLAG", 40: "UT_MOD_GOOMBA"})
+            self.urt_modversion = 41
+            logger.info("Game modversion       : 4.1")
+
+        if gametype in ('0', '1', '9', '11'):
+            # disable teamkill event and some commands for FFA (0), LMS (1), Jump (9), Gun (11)
+            self.ffa_lms_gametype = True
+        elif gametype == '7':
+            self.ctf_gametype = True
+        elif gametype in ('4', '5'):
+            self.ts_gametype = True
+        elif gametype == '3':
+            self.tdm_gametype = True
+        elif gametype == '8':
+            self.bomb_gametype = True
+        elif gametype == '10':
+            self.freeze_gametype = True
+
+        # get default g_gear value
+        self.default_gear = values['g_gear'] if 'g_gear' in values else "%s" % '' if self.urt_modversion > 41 else '0'
+
+    def start(self):
+        """
+        schedule the tasks, find the current game and create the instance of Game
         """
         if self.task_frequency > 0:
             # schedule the task
@@ -495,24 +928,106 @@ class LogParser(object):
                 schedule.every(10).seconds.do(self.taskmanager)
             else:
                 schedule.every(self.task_frequency).seconds.do(self.taskmanager)
-        # schedule the task
-        schedule.every(2).hours.do(self.remove_expired_db_entries)
 
         self.find_game_start()
 
         # create instance of Game
-        self.game = Game(self.urt_modversion)
+        self.game = Game(self.urt_modversion, section=self.section, rcon_client=self.rcon_client)
 
-        self.log_file.seek(0, 2)
-        while self.log_file:
-            schedule.run_pending()
-            line = self.log_file.readline()
-            if line:
+        # continue at the last checkpoint or at the end of the file
+        self.log_source.resume()
+
+    def read_log(self):
+        """
+        read and parse the next batch of lines of the logfile
+
+        @return: True if lines have been read, False if the end of the logfile has been reached
+        @rtype: Boolean
+        """
+        lines = self.log_source.read_lines()
+        if lines:
+            for line in lines:
                 self.parse_line(line)
-            else:
-                if not self.game.live:
-                    self.game.go_live()
-                time.sleep(.125)
+            self.log_source.checkpoint(len(lines))
+            return True
+        if not self.game.live:
+            self.game.go_live()
+        return False
+
+    def replay(self, filename):
+        """
+        feed a recorded game log through the parser at maximum speed and report the results
+
+        @param filename: The full path of the recorded games.log file
+        @type  filename: String
+        """
+        try:
+            log_tail = LogTail(filename)
+        except IOError:
+            logger.error("ERROR: The Gamelog file '%s' has not been found", filename)
+            return
+        # modversion and game type of the first game in the log
+        for line in log_tail.log_file:
+            tmp = line.split()
+            if len(tmp) > 1 and tmp[1] == "InitGame:":
+                self.set_game_info(self.explode_line(line.split('InitGame:', 1)[1]))
+                break
+        log_tail.seek(0)
+
+        rcon_sink = RconSink()
+        self.game = Game(self.urt_modversion, rcon_sink=rcon_sink)
+        handler_stats, counter = self.profile_handlers()
+        logger.info("Replaying Gamelog file: %s", filename)
+        num_lines = 0
+        start = time.time()
+        while 1:
+            lines = log_tail.read_lines()
+            if not lines:
+                break
+            for line in lines:
+                self.parse_line(line)
+            num_lines += len(lines)
+        duration = max(time.time() - start, 0.000001)
+
+        logger.info("Replay finished       : %d lines, %d events in %.3f s = %.0f events/s", num_lines, counter['events'], duration, counter['events'] / duration)
+        logger.info("%-22s %9s %12s %10s", "Handler", "Calls", "Total [ms]", "Avg [us]")
+        for name, stats in sorted(handler_stats.iteritems(), key=lambda item: item[1][1], reverse=True):
+            if stats[0]:
+                logger.info("%-22s %9d %12.1f %10.1f", name, stats[0], stats[1] * 1000, stats[1] * 1000000 / stats[0])
+        logger.info("RCON commands captured: %d", len(rcon_sink.commands))
+        for table in ('player', 'xlrstats', 'ban_list', 'ban_points'):
+            curs.execute("SELECT COUNT(*) FROM `{}`".format(table))
+            logger.info("Database table %-8s: %d rows", table, curs.fetchone()[0])
+
+    def profile_handlers(self):
+        """
+        wrap all log event handlers to count the calls and measure the time spent in each handler
+        """
+        handler_stats = {}
+        # handlers called by other handlers are not counted as events
+        counter = {'events': 0, 'depth': 0}
+
+        def profile(name, handler):
+            stats = handler_stats[name] = [0, 0.0]
+
+            def wrapper(*args):
+                if not counter['depth']:
+                    counter['events'] += 1
+                counter['depth'] += 1
+                start = time.time()
+                try:
+                    return handler(*args)
+                finally:
+                    stats[0] += 1
+                    stats[1] += time.time() - start
+                    counter['depth'] -= 1
+            return wrapper
+
+        for name in dir(self):
+            if name.startswith('handle_') or name == 'new_game':
+                setattr(self, name, profile(name, getattr(self, name)))
+        self.dispatch = self.get_dispatch_table()
+        return handler_stats, counter
 
     def remove_expired_db_entries(self):
         """
@@ -610,45 +1125,55 @@ class LogParser(object):
         """
         if self.max_ping > 0:
             # rcon update status
-            self.game.quake.rcon_update()
-            for player in self.game.quake.players or []:
-                # if ping is too high, increase warn counter, Admins or higher levels will not get the warning
-                try:
-                    ping_value = player.ping
-                    gameplayer = self.game.players[player.num]
-                except KeyError:
-                    continue
-                else:
-                    if self.max_ping < ping_value < 999 and gameplayer.get_admin_role() < self.admin_immunity:
-                        gameplayer.add_high_ping(ping_value)
-                        self.game.rcon_tell(player.num, "^1WARNING ^7[^3%d^7]: Your ping is too high [^4%d^7]. ^3The maximum allowed ping is %d." % (gameplayer.get_warning(), ping_value, self.max_ping), False)
+            self.game.request_rcon_status(self.check_ping_values)
+
+    def check_ping_values(self, players):
+        """
+        set warning for players with high ping
+
+        @param players: The players of the RCON status or None if the server did not respond
+        @type  players: List
+        """
+        try:
+            with self.players_lock:
+                for player in players or []:
+                    # if ping is too high, increase warn counter, Admins or higher levels will not get the warning
+                    try:
+                        ping_value = player.ping
+                        gameplayer = self.game.players[player.num]
+                    except KeyError:
+                        continue
                     else:
-                        gameplayer.clear_specific_warning('fix your ping')
+                        if self.max_ping < ping_value < 999 and gameplayer.get_admin_role() < self.admin_immunity:
+                            gameplayer.add_high_ping(ping_value)
+                            self.game.rcon_tell(player.num, "^1WARNING ^7[^3%d^7]: Your ping is too high [^4%d^7]. ^3The maximum allowed ping is %d." % (gameplayer.get_warning(), ping_value, self.max_ping), False)
+                        else:
+                            gameplayer.clear_specific_warning('fix your ping')
+        except Exception as err:
+            logger.error(err, exc_info=True)
+
+    def get_dispatch_table(self):
+        """
+        return the handler of each log event action
+        """
+        return {'InitGame': self.new_game, 'Warmup': self.handle_warmup, 'InitRound': self.handle_initround,
+                'Exit': self.handle_exit, 'say': self.handle_say, 'sayteam': self.handle_say, 'saytell': self.handle_saytell,
+                'ClientUserinfo': self.handle_userinfo, 'ClientUserinfoChanged': self.handle_userinfo_changed,
+                'ClientBegin': self.handle_begin, 'ClientDisconnect': self.handle_disconnect,
+                'SurvivorWinner': self.handle_teams_ts_mode, 'Kill': self.handle_kill, 'Hit': self.handle_hit,
+                'Freeze': self.handle_freeze, 'ThawOutFinished': self.handle_thawout, 'ClientSpawn': self.handle_spawn,
+                'Flag': self.handle_flag, 'FlagCaptureTime': self.handle_flagcapturetime,
+                'VotePassed': self.handle_vote_passed, 'VoteFailed': self.handle_vote_failed, 'Callvote': self.handle_callvote,
+                'Bomb': self.handle_bomb, 'Pop': self.handle_bomb_exploded}
 
     def parse_line(self, string):
         """
         parse the logfile and search for specific action
         """
-        line = string[7:]
-        tmp = line.split(":", 1)
-        line = tmp[1].strip() if len(tmp) > 1 else tmp[0].strip()
-        option = {'InitGame': self.new_game, 'Warmup': self.handle_warmup, 'InitRound': self.handle_initround,
-                  'Exit': self.handle_exit, 'say': self.handle_say, 'sayteam': self.handle_say, 'saytell': self.handle_saytell,
-                  'ClientUserinfo': self.handle_userinfo, 'ClientUserinfoChanged': self.handle_userinfo_changed,
-                  'ClientBegin': self.handle_begin, 'ClientDisconnect': self.handle_disconnect,
-                  'SurvivorWinner': self.handle_teams_ts_mode, 'Kill': self.handle_kill, 'Hit': self.handle_hit,
-                  'Freeze': self.handle_freeze, 'ThawOutFinished': self.handle_thawout, 'ClientSpawn': self.handle_spawn,
-                  'Flag': self.handle_flag, 'FlagCaptureTime': self.handle_flagcapturetime,
-                  'VotePassed': self.handle_vote_passed, 'VoteFailed': self.handle_vote_failed, 'Callvote': self.handle_callvote}
-
         try:
-            action = tmp[0].strip()
-            if action in option:
-                option[action](line)
-            elif 'Bomb' in action:
-                self.handle_bomb(line)
-            elif 'Pop' in action:
-                self.handle_bomb_exploded()
+            event = events.tokenize(string)
+            if event is not None and event.action in self.dispatch:
+                self.dispatch[event.action](event)
         except (IndexError, KeyError):
             pass
         except Exception as err:
@@ -658,24 +1183,13 @@ class LogParser(object):
         """
         explode line
         """
-        arr = line.lstrip().lstrip('\\').split('\\')
-        key = True
-        key_val = None
-        values = {}
-        for item in arr:
-            if key:
-                key_val = item
-                key = False
-            else:
-                values[key_val.rstrip()] = item.rstrip()
-                key_val = None
-                key = True
-        return values
+        return events.explode_line(line)
 
-    def handle_vote_passed(self, line):
+    def handle_vote_passed(self, event):
         """
         handle vote passed
         """
+        line = event.data
         # nextmap vote
         if "g_nextmap" in line:
             self.game.next_mapname = line.split("g_nextmap")[-1].strip('"').strip()
@@ -688,10 +1202,11 @@ class LogParser(object):
         elif "clientkickreason" in line:
             self.game.rcon_say("^7Vote to kick %s ^2passed" % self.game.players[int(line.split('"clientkickreason "')[-1].strip('"'))].get_name())
 
-    def handle_vote_failed(self, line):
+    def handle_vote_failed(self, event):
         """
         handle vote failed
         """
+        line = event.data
         # nextmap vote
         if "g_nextmap" in line:
             self.game.rcon_say("^7Vote to set next map to '%s' ^1failed" % line.split("g_nextmap")[-1].strip('"').strip())
@@ -704,10 +1219,11 @@ class LogParser(object):
         elif "clientkickreason" in line:
             self.game.rcon_say("^7Vote to kick %s ^1failed" % self.game.players[int(line.split('"clientkickreason "')[-1].strip('"'))].get_name())
 
-    def handle_callvote(self, line):
+    def handle_callvote(self, event):
         """
         handle callvote
         """
+        line = event.data
         if "g_nextmap" in line:
             self.last_vote = "nextmap"
         elif "cyclemap" in line:
@@ -730,21 +1246,24 @@ class LogParser(object):
             if self.game.get_last_maps() and ('"g_nextmap' in line or '"map' in line):
                 self.game.rcon_say("^7Last Maps: ^3%s" % ", ".join(self.game.get_last_maps()))
 
-    def new_game(self, line):
+    def new_game(self, event):
         """
         set-up a new game
         """
-        self.ffa_lms_gametype = True if ('g_gametype\\0\\' in line or 'g_gametype\\1\\' in line or 'g_gametype\\9\\' in line or 'g_gametype\\11\\' in line) else False
-        self.ctf_gametype = True if 'g_gametype\\7\\' in line else False
-        self.ts_gametype = True if ('g_gametype\\4\\' in line or 'g_gametype\\5\\' in line) else False
-        self.tdm_gametype = True if 'g_gametype\\3\\' in line else False
-        self.bomb_gametype = True if 'g_gametype\\8\\' in line else False
-        self.freeze_gametype = True if 'g_gametype\\10\\' in line else False
+        gametype = event.values.get('g_gametype')
+        self.ffa_lms_gametype = gametype in ('0', '1', '9', '11')
+        self.ctf_gametype = gametype == '7'
+        self.ts_gametype = gametype in ('4', '5')
+        self.tdm_gametype = gametype == '3'
+        self.bomb_gametype = gametype == '8'
+        self.freeze_gametype = gametype == '10'
         logger.debug("InitGame: Starting game...")
         self.game.rcon_clear()
         # reset the player stats
         self.stats_reset()
 
+        # read the CVARs of a new game with a single query
+        self.game.get_cvars(('g_mapcycle', 'g_bombexplodetime') if self.bomb_gametype else ('g_mapcycle',))
         # set the current map
         self.game.set_current_map()
         # load all available maps
@@ -767,32 +1286,30 @@ class LogParser(object):
         self.allow_nextmap_vote = True
         self.failed_vote_timer = 0
 
-    def handle_spawn(self, line):
+    def handle_spawn(self, event):
         """
         handle client spawn
         """
-        player_num = int(line)
         with self.players_lock:
-            self.game.players[player_num].set_alive(True)
+            self.game.players[event.player_num].set_alive(True)
 
-    def handle_flagcapturetime(self, line):
+    def handle_flagcapturetime(self, event):
         """
         handle flag capture time
         """
-        tmp = line.split(": ", 1)
-        player_num = int(tmp[0])
-        action = tmp[1]
+        player_num = event.player_num
+        action = event.data.split(": ", 1)[1]
         if action.isdigit():
             cap_time = round(float(action) / 1000, 2)
             logger.debug("Player %d captured the flag in %s seconds", player_num, cap_time)
             with self.players_lock:
                 self.game.players[player_num].set_flag_capture_time(cap_time)
 
-    def handle_warmup(self, line):
+    def handle_warmup(self, event):
         """
         handle warmup
         """
-        logger.debug("Warmup... %s", line)
+        logger.debug("Warmup... %s", event.data)
         self.allow_cmd_teams = True
 
     def handle_initround(self, _):
@@ -808,11 +1325,11 @@ class LogParser(object):
             if self.allow_cmd_teams_round_end:
                 self.allow_cmd_teams = False
 
-    def handle_exit(self, line):
+    def handle_exit(self, event):
         """
         handle Exit of a match, show Awards, store user score in database and reset statistics
         """
-        logger.debug("Exit: %s", line)
+        logger.debug("Exit: %s", event.data)
         self.handle_awards()
         self.allow_cmd_teams = True
         self.stats_reset(store_score=True)
@@ -843,14 +1360,34 @@ class LogParser(object):
             self.firstknifekill = False
             self.firstteamkill = False
 
-    def handle_userinfo(self, line):
+    def userinfo_unchanged(self, event):
+        """
+        return True if the user information of the player is unchanged since the last line, otherwise decode it
+
+        @param event: The ClientUserinfo or ClientUserinfoChanged event
+        @type  event: Instance
+        """
+        cached = self.userinfo_cache.get((event.action, event.player_num))
+        if cached is not None and cached[0] == event.info:
+            return True
+        event.decode(cached[1] if cached is not None else None)
+        return False
+
+    def cache_userinfo(self, event):
+        """
+        remember the handled user information of the player
+        """
+        self.userinfo_cache[(event.action, event.player_num)] = (event.info, event.values)
+
+    def handle_userinfo(self, event):
         """
         handle player user information, auto-kick known cheater ports or guids
         """
         with self.players_lock:
-            player_num = int(line[:2].strip())
-            line = line[2:].lstrip("\\").lstrip()
-            values = self.explode_line(line)
+            if self.userinfo_unchanged(event):
+                return
+            player_num = event.player_num
+            values = event.values
             challenge = 'challenge' in values
             name = values['name'] if 'name' in values else "UnnamedPlayer"
             ip_port = values['ip'] if 'ip' in values else "0.0.0.0:0"
@@ -891,11 +1428,12 @@ class LogParser(object):
             if self.game.players[player_num].get_authname() != auth:
                 self.game.players[player_num].set_authname(auth)
 
-            # kick player with hax guid 'kemfew'
-            if "KEMFEW" in guid.upper():
-                self.kick_player_reason("Cheater GUID detected for %s -> Player kicked" % name, player_num)
-            if "WORLD" in guid.upper() or "UNKNOWN" in guid.upper():
-                self.kick_player_reason("Invalid GUID detected for %s -> Player kicked" % name, player_num)
+            if 'cl_guid' in event.changed:
+                # kick player with hax guid 'kemfew'
+                if "KEMFEW" in guid.upper():
+                    self.kick_player_reason("Cheater GUID detected for %s -> Player kicked" % name, player_num)
+                if "WORLD" in guid.upper() or "UNKNOWN" in guid.upper():
+                    self.kick_player_reason("Invalid GUID detected for %s -> Player kicked" % name, player_num)
 
             if challenge:
                 logger.debug("ClientUserinfo: Player %d %s is challenging the server and has the guid %s", player_num, self.game.players[player_num].get_name(), guid)
@@ -905,27 +1443,33 @@ class LogParser(object):
                     self.kick_player_reason("Cheater Port detected for %s -> Player kicked" % name, player_num)
                 if self.last_disconnected_player and self.last_disconnected_player.get_guid() == self.game.players[player_num].get_guid():
                     self.last_disconnected_player = None
+            self.cache_userinfo(event)
 
     def kick_player_reason(self, reason, player_num):
         """
         kick player for specific reason
         """
         if self.urt_modversion > 41:
-            self.game.send_rcon('kick %d "%s"' % (player_num, reason))
+            self.game.send_rcon('kick %d "%s"' % (player_num, reason), RCON_ENFORCE)
         else:
-            self.game.send_rcon("kick %d" % player_num)
-            self.game.send_rcon(reason)
+            self.game.send_rcon("kick %d" % player_num, RCON_ENFORCE)
+            self.game.send_rcon(reason, RCON_ENFORCE)
 
-    def handle_userinfo_changed(self, line):
+    def handle_userinfo_changed(self, event):
         """
         handle player changes
         """
         with self.players_lock:
-            player_num = int(line[:2].strip())
+            if self.userinfo_unchanged(event):
+                return
+            player_num = event.player_num
             player = self.game.players[player_num]
-            line = line[2:].lstrip("\\")
+            if 't' not in event.changed and 'n' not in event.changed and player.get_team() == int(event.values.get('t', 3)):
+                # neither team nor name changed, e.g. new skin or gear
+                self.cache_userinfo(event)
+                return
             try:
-                values = self.explode_line(line)
+                values = event.values
                 team_num = int(values['t'])
                 player.set_team(team_num)
                 name = values['n']
@@ -944,13 +1488,14 @@ class LogParser(object):
                 self.game.rcon_forceteam(player_num, team_lock)
                 self.game.rcon_tell(player_num, "^3You are forced to: ^7%s" % team_lock)
             logger.debug("ClientUserinfoChanged: Player %d %s joined team %s", player_num, name, Player.teams[team_num])
+            self.cache_userinfo(event)
 
-    def handle_begin(self, line):
+    def handle_begin(self, event):
         """
         handle player entering game
         """
         with self.players_lock:
-            player_num = int(line)
+            player_num = event.player_num
             player = self.game.players[player_num]
             player_name = player.get_name()
             player_auth = player.get_authname()
@@ -970,12 +1515,12 @@ class LogParser(object):
                 player.disable_welcome_msg()
             logger.debug("ClientBegin: Player %d %s has entered the game", player_num, player_name)
 
-    def handle_disconnect(self, line):
+    def handle_disconnect(self, event):
         """
         handle player disconnect
         """
         with self.players_lock:
-            player_num = int(line)
+            player_num = event.player_num
             player = self.game.players[player_num]
             player_name = player.get_name()
             player.save_info()
@@ -984,65 +1529,50 @@ class LogParser(object):
             if player.get_admin_role() >= 40:
                 self.last_admin = player
             del self.game.players[player_num]
+            # the next player in this slot sends new user information
+            self.userinfo_cache.pop(('ClientUserinfo', player_num), None)
+            self.userinfo_cache.pop(('ClientUserinfoChanged', player_num), None)
             for player in self.game.players.itervalues():
                 player.clear_tk(player_num)
                 player.clear_grudged_player(player_num)
             logger.debug("ClientDisconnect: Player %d %s has left the game", player_num, player_name)
 
-    def handle_hit(self, line):
+    def handle_hit(self, event):
         """
         handle all kind of hits
         """
         with self.players_lock:
-            info = line.split(":", 1)[0].split()
-            hitter_id = int(info[1])
-            victim_id = int(info[0])
+            hitter_id = event.hitter_id
+            victim_id = event.victim_id
             hitter = self.game.players[hitter_id]
             hitter_name = hitter.get_name()
-            hitpoint = int(info[2])
-            hit_item = int(info[3])
+            hitpoint = event.hitpoint
+            hit_item = event.hit_item
             # increase summary of all hits
             hitter.set_all_hits()
 
-            zones = {'TORSO': 'body', 'VEST': 'body', 'KEVLAR': 'body', 'BUTT': 'body', 'GROIN': 'body',
-                     'LEGS': 'legs', 'LEFT_UPPER_LEG': 'legs', 'RIGHT_UPPER_LEG': 'legs',
-                     'LEFT_LOWER_LEG': 'legs', 'RIGHT_LOWER_LEG': 'legs', 'LEFT_FOOT': 'legs', 'RIGHT_FOOT': 'legs',
-                     'ARMS': 'arms', 'LEFT_ARM': 'arms', 'RIGHT_ARM': 'arms'}
-
             if hitpoint in self.hit_points:
                 if self.hit_points[hitpoint] in ('HEAD', 'HELMET'):
                     hitter.headshot()
                     hitter_hs_count = hitter.get_headshots()
-                    hs_msg = {5: 'watch out!',
-                              10: 'awesome!',
-                              15: 'unbelievable!',
-                              20: '^1MANIAC!',
-                              25: '^2AIMBOT?',
-                              30: 'stop that',
-                              35: 'stop that ^5NOW',
-                              40: '^6OMG ^7stop it',
-                              45: 'no mercy',
-                              50: '^2HEAD RIPPER'}
-                    if self.spam_headshot_hits_msg and hitter_hs_count in hs_msg:
-                        self.game.rcon_bigtext("^3%s: ^2%d ^7HeadShots, %s" % (hitter_name, hitter_hs_count, hs_msg[hitter_hs_count]))
+                    if self.spam_headshot_hits_msg and hitter_hs_count in self.hs_msg:
+                        self.game.rcon_bigtext("^3%s: ^2%d ^7HeadShots, %s" % (hitter_name, hitter_hs_count, self.hs_msg[hitter_hs_count]))
                     hs_plural = "headshots" if hitter_hs_count > 1 else "headshot"
                     percentage = int(round(float(hitter_hs_count) / float(hitter.get_all_hits()), 2) * 100)
-                    self.game.send_rcon("^7%s has ^2%d ^7%s (%d percent)" % (hitter_name, hitter_hs_count, hs_plural, percentage))
-                elif self.hit_points[hitpoint] in zones:
-                    hitter.set_hitzones(zones[self.hit_points[hitpoint]])
+                    self.game.send_rcon("^7%s has ^2%d ^7%s (%d percent)" % (hitter_name, hitter_hs_count, hs_plural, percentage), priority=RCON_BROADCAST, merge_key=('headshots', hitter_id))
+                elif self.hit_points[hitpoint] in self.hit_zones:
+                    hitter.set_hitzones(self.hit_zones[self.hit_points[hitpoint]])
                 logger.debug("Player %d %s hit %d %s in the %s with %s", hitter_id, hitter_name, victim_id, self.game.players[victim_id].get_name(), self.hit_points[hitpoint], self.hit_item[hit_item])
 
-    def handle_kill(self, line):
+    def handle_kill(self, event):
         """
         handle kills
         """
         with self.players_lock:
-            parts = line.split(":", 1)
-            info = parts[0].split()
-            k_name = parts[1].split()[0]
-            killer_id = int(info[0])
-            victim_id = int(info[1])
-            death_cause = self.death_cause[int(info[2])]
+            k_name = event.killer_name
+            killer_id = event.killer_id
+            victim_id = event.victim_id
+            death_cause = self.death_cause[event.death_cause]
             victim = self.game.players[victim_id]
             victim.set_alive(False)
 
@@ -1088,18 +1618,15 @@ class LogParser(object):
                             if killer.get_warning() == 3 and killer.get_admin_role() < self.admin_immunity:
                                 self.game.rcon_say("^1ALERT: ^2%s ^7auto-kick from warnings if not forgiven. Type ^3!forgive %s ^7to forgive" % (killer_name, killer_id))
 
-            suicide_reason = ['UT_MOD_SUICIDE', 'MOD_FALLING', 'MOD_WATER', 'MOD_LAVA', 'MOD_TRIGGER_HURT',
-                              'UT_MOD_SPLODED', 'UT_MOD_SLAPPED', 'UT_MOD_SMITED']
-            suicide_weapon = ['UT_MOD_HEGRENADE', 'UT_MOD_HK69', 'UT_MOD_NUKED', 'UT_MOD_BOMBED']
             # suicide counter
-            if death_cause in suicide_reason or (killer_id == victim_id and death_cause in suicide_weapon):
+            if death_cause in self.suicide_reason or (killer_id == victim_id and death_cause in self.suicide_weapon):
                 victim.suicide()
                 victim.die()
                 logger.debug("Player %d %s committed suicide with %s", victim_id, victim_name, death_cause)
             # kill counter
-            elif not tk_event and int(info[2]) != 10:  # 10: MOD_CHANGE_TEAM
+            elif not tk_event and event.death_cause != 10:  # 10: MOD_CHANGE_TEAM
                 if killer.get_losing_streak() >= 5:
-                    self.game.rcon_say("^7You are back in business ^7%s" % killer_name)
+                    self.game.rcon_say("^7You are back in business ^7%s" % killer_name, priority=RCON_BROADCAST)
                 killer.kill()
 
                 # spawn killing - warn/kick or instant kill
@@ -1119,11 +1646,11 @@ class LogParser(object):
                 # multi kill message
                 if self.show_multikill_msg:
                     if killer.get_monsterkill() == 2:
-                        self.game.rcon_say("^7%s: ^2Double Kill!" % killer_name)
+                        self.game.rcon_say("^7%s: ^2Double Kill!" % killer_name, priority=RCON_BROADCAST, merge_key=('multikill', killer_id))
                     elif killer.get_monsterkill() == 3:
-                        self.game.rcon_say("^7%s: ^1Multi Kill!" % killer_name)
+                        self.game.rcon_say("^7%s: ^1Multi Kill!" % killer_name, priority=RCON_BROADCAST, merge_key=('multikill', killer_id))
                     elif killer.get_monsterkill() == 4:
-                        self.game.rcon_say("^7%s: ^1MONSTER KILL!!" % killer_name)
+                        self.game.rcon_say("^7%s: ^1MONSTER KILL!!" % killer_name, priority=RCON_BROADCAST, merge_key=('multikill', killer_id))
 
                 # first kill message
                 if self.firstblood:
@@ -1149,54 +1676,43 @@ class LogParser(object):
                     if death_cause == 'UT_MOD_BOMBED':
                         killer.kills_with_bomb()
 
-                event_series_msg = {5: 'go on!',
-                                    10: 'beware!',
-                                    15: 'eat that!',
-                                    20: 'got pwned!',
-                                    25: 'impressive!',
-                                    30: 'dominating!'}
-
                 # HE grenade kill
                 if death_cause == 'UT_MOD_HEGRENADE':
                     killer.set_he_kill()
                     he_kill_count = killer.get_he_kills()
-                    if self.spam_nade_kills_msg and he_kill_count in event_series_msg:
-                        self.game.rcon_bigtext("^3%s: ^2%d ^7HE grenade kills, %s" % (killer_name, he_kill_count, event_series_msg[he_kill_count]))
+                    if self.spam_nade_kills_msg and he_kill_count in self.event_series_msg:
+                        self.game.rcon_bigtext("^3%s: ^2%d ^7HE grenade kills, %s" % (killer_name, he_kill_count, self.event_series_msg[he_kill_count]))
 
                 # Knife kill
                 if "UT_MOD_KNIFE" in death_cause or "UT_MOD_KNIFE_THROWN" in death_cause:
                     killer.set_knife_kill()
                     knife_kill_count = killer.get_knife_kills()
-                    if self.spam_knife_kills_msg and knife_kill_count in event_series_msg:
-                        self.game.rcon_bigtext("^3%s: ^2%d ^7knife kills, %s" % (killer_name, knife_kill_count, event_series_msg[knife_kill_count]))
+                    if self.spam_knife_kills_msg and knife_kill_count in self.event_series_msg:
+                        self.game.rcon_bigtext("^3%s: ^2%d ^7knife kills, %s" % (killer_name, knife_kill_count, self.event_series_msg[knife_kill_count]))
 
                 # killing spree counter
                 killer_color = "^1" if (killer.get_team() == 1) else "^4"
                 killer_killing_streak = killer.get_killing_streak()
-                kill_streak_msg = {5: "is on a killing spree (^15 ^7kills in a row)",
-                                   10: "is on a rampage (^110 ^7kills in a row)",
-                                   15: "is unstoppable (^115 ^7kills in a row)",
-                                   20: "is godlike (^120 ^7kills in a row)"}
-                if killer_killing_streak in kill_streak_msg and killer_id != BOT_PLAYER_NUM:
-                    self.game.rcon_say("%s%s ^7%s" % (killer_color, killer_name, kill_streak_msg[killer_killing_streak]))
+                if killer_killing_streak in self.kill_streak_msg and killer_id != BOT_PLAYER_NUM:
+                    self.game.rcon_say("%s%s ^7%s" % (killer_color, killer_name, self.kill_streak_msg[killer_killing_streak]), priority=RCON_BROADCAST, merge_key=('streak', killer_id))
 
                 victim_color = "^1" if (victim.get_team() == 1) else "^4"
                 if victim.get_killing_streak() >= 20 and killer_name != victim_name and killer_id != BOT_PLAYER_NUM:
-                    self.game.rcon_say("%s%s's ^7godlike (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name))
+                    self.game.rcon_say("%s%s's ^7godlike (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name), priority=RCON_BROADCAST)
                 elif victim.get_killing_streak() >= 15 and killer_name != victim_name and killer_id != BOT_PLAYER_NUM:
-                    self.game.rcon_say("%s%s's ^7unstoppable (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name))
+                    self.game.rcon_say("%s%s's ^7unstoppable (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name), priority=RCON_BROADCAST)
                 elif victim.get_killing_streak() >= 10 and killer_name != victim_name and killer_id != BOT_PLAYER_NUM:
-                    self.game.rcon_say("%s%s's ^7rampage (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name))
+                    self.game.rcon_say("%s%s's ^7rampage (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name), priority=RCON_BROADCAST)
                 elif victim.get_killing_streak() >= 5 and killer_name != victim_name and killer_id != BOT_PLAYER_NUM:
-                    self.game.rcon_say("%s%s's ^7killing spree (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name))
+                    self.game.rcon_say("%s%s's ^7killing spree (^1%s ^7kills) was ended by %s%s!" % (victim_color, victim_name, victim.get_killing_streak(), killer_color, killer_name), priority=RCON_BROADCAST)
 
                 # death counter
                 victim.die()
                 if victim.get_losing_streak() == 5:
-                    self.game.rcon_say("^7Keep it up ^3%s^7, it will come eventually" % victim_name)
+                    self.game.rcon_say("^7Keep it up ^3%s^7, it will come eventually" % victim_name, priority=RCON_BROADCAST)
 
                 if self.show_hit_stats_msg:
-                    self.game.rcon_tell(victim_id, "^1HIT Stats: ^7HS: ^2%s ^7BODY: ^2%s ^7ARMS: ^2%s ^7LEGS: ^2%s ^7TOTAL: ^2%s" % (victim.get_headshots(), victim.get_hitzones('body'), victim.get_hitzones('arms'), victim.get_hitzones('legs'), victim.get_all_hits()))
+                    self.game.rcon_tell(victim_id, "^1HIT Stats: ^7HS: ^2%s ^7BODY: ^2%s ^7ARMS: ^2%s ^7LEGS: ^2%s ^7TOTAL: ^2%s" % (victim.get_headshots(), victim.get_hitzones('body'), victim.get_hitzones('arms'), victim.get_hitzones('legs'), victim.get_all_hits()), priority=RCON_BROADCAST, merge_key=('hitstats', victim_id))
                 logger.debug("Player %d %s killed %d %s with %s", killer_id, killer_name, victim_id, victim_name, death_cause)
 
     def player_found(self, user):
@@ -1269,16 +1785,12 @@ class LogParser(object):
             ret_val = True, map_list[0], None
         return ret_val
 
-    def handle_saytell(self, line):
+    def handle_saytell(self, event):
         """
         handle saytell commands
         """
-        tmp = line.strip()
-        try:
-            new = "%s%s" % (tmp[0], ''.join(tmp[1:]))
-            self.handle_say(new)
-        except IndexError:
-            pass
+        if event.data:
+            self.handle_say(event)
 
     def clean_cmd_list(self, cmd_list):
         """
@@ -1307,7 +1819,7 @@ class LogParser(object):
                 pass
         return clean_list
 
-    def handle_say(self, line):
+    def handle_say(self, event):
         """
         handle say commands
         """
@@ -1319,20 +1831,16 @@ class LogParser(object):
                      'kurwa', 'suka', 'dupa', 'dupek', 'puta', 'maricon']
 
         with self.players_lock:
-            line = line.strip()
-            try:
-                divider = line.split(": ", 1)
-                number = divider[0].split(" ", 1)[0]
-                name_saycmd = divider[0].split(" ", 1)[1]
-                cmd = divider[1].split()[0]
-                sar = {'player_num': int(number), 'command': cmd}
-            except IndexError:
+            line = event.data
+            if event.player_num is None:
+                sar = {'player_num': 0, 'command': ''}
+            elif event.name is None or not event.command:
                 sar = {'player_num': BOT_PLAYER_NUM, 'command': ''}
-            except ValueError:
-                sar = {'player_num': 0, 'command': str(line.split(": ", 1)).split(" ", 1)[0]}
+            else:
+                sar = {'player_num': event.player_num, 'command': event.command}
 
             # when haunting player and entering command, the haunted player is the caller, therefore ignore command
-            if self.game.players[sar['player_num']].get_name() != name_saycmd:
+            if self.game.players[sar['player_num']].get_name() != event.name:
                 sar = {'player_num': BOT_PLAYER_NUM, 'command': ''}
 
             if sar['command'] == '!mapstats':
@@ -2105,8 +2613,7 @@ class LogParser(object):
                         self.game.rcon_tell(sar['player_num'], msg)
                     else:
                         # update rcon status
-                        self.game.quake.rcon_update()
-                        for player in self.game.quake.players:
+                        for player in self.game.get_rcon_status():
                             if victim.get_player_num() == player.num:
                                 player_ping = player.ping
                         msg = "^7%s has a ping of ^2%s ms" % (victim.get_name(), player_ping)
@@ -2209,6 +2716,7 @@ class LogParser(object):
                 curs.execute("SELECT 1 FROM player LIMIT 1;")
                 msg = "^7Database is ^2UP^7 and Bot started at ^2%s" % self.uptime if curs.fetchall() else "^7Database appears to be ^1DOWN"
                 self.game.rcon_tell(sar['player_num'], msg)
+                self.game.rcon_tell(sar['player_num'], "^7RCON queue: ^2%d ^7queued, oldest ^2%.1f ^7s, ^2%d ^7dropped, ^2%d ^7merged" % self.game.get_rcon_stats())
 
             # version - display the version of the bot
             elif sar['command'] == '!version' and self.game.players[sar['player_num']].get_admin_role() >= COMMANDS['version']['level']:
@@ -2228,8 +2736,7 @@ class LogParser(object):
                         self.game.rcon_tell(sar['player_num'], msg)
                     else:
                         # update rcon status
-                        self.game.quake.rcon_update()
-                        for player in self.game.quake.players:
+                        for player in self.game.get_rcon_status():
                             if victim.get_player_num() == player.num:
                                 player_ping = player.ping
                         if player_ping == 999:
@@ -2954,29 +3461,28 @@ class LogParser(object):
             append("%s second%s" % (secs, 's' if secs > 1 else ''))
         return duration, ' '.join(duration_output)
 
-    def handle_flag(self, line):
+    def handle_flag(self, event):
         """
         handle flag
         """
         with self.players_lock:
-            tmp = line.split()
-            player_num = int(tmp[0])
+            player_num = event.player_num
             player = self.game.players[player_num]
             player_name = player.get_name()
-            action = tmp[1]
-            if action == '1:':
+            if event.flag_action == 1:
                 player.return_flag()
                 logger.debug("Player %d %s returned the flag", player_num, player_name)
-            elif action == '2:':
+            elif event.flag_action == 2:
                 player.capture_flag()
                 cap_count = player.get_flags_captured()
-                self.game.send_rcon("^7%s has captured ^2%s ^7flag%s" % (player_name, cap_count, 's' if cap_count > 1 else ''))
+                self.game.send_rcon("^7%s has captured ^2%s ^7flag%s" % (player_name, cap_count, 's' if cap_count > 1 else ''), priority=RCON_BROADCAST)
                 logger.debug("Player %d %s captured the flag", player_num, player_name)
 
-    def handle_bomb(self, line):
+    def handle_bomb(self, event):
         """
         handle bomb
         """
+        line = event.data
         with self.players_lock:
             tmp = line.split("is") if "Bombholder" in line else line.split("by")
             action = tmp[0].strip()
@@ -2986,8 +3492,8 @@ class LogParser(object):
             if action == 'Bomb was defused':
                 player.defused_bomb()
                 logger.debug("Player %d %s defused the bomb", player_num, name)
-                self.game.send_rcon("^7The ^2BOMB ^7has been defused by ^2%s^7!" % name)
-                self.handle_teams_ts_mode('Blue')
+                self.game.send_rcon("^7The ^2BOMB ^7has been defused by ^2%s^7!" % name, priority=RCON_BROADCAST)
+                self.handle_teams_ts_mode(events.LogEvent('SurvivorWinner', 'Blue'))
                 # kill all survived red players
                 if self.kill_survived_opponents and self.urt_modversion > 41:
                     for player in self.game.players.itervalues():
@@ -2996,7 +3502,7 @@ class LogParser(object):
             elif action == 'Bomb was planted':
                 player.planted_bomb()
                 logger.debug("Player %d %s planted the bomb", player_num, name)
-                self.game.send_rcon("^7The ^1BOMB ^7has been planted by ^1%s^7! ^2%s ^7seconds to detonation." % (name, self.explode_time))
+                self.game.send_rcon("^7The ^1BOMB ^7has been planted by ^1%s^7! ^2%s ^7seconds to detonation." % (name, self.explode_time), priority=RCON_BROADCAST)
                 if self.spam_bomb_planted_msg:
                     self.game.rcon_bigtext("^1The ^7BOMB ^1has been planted by ^7%s^1!" % name)
                     self.game.rcon_bigtext("^7The ^1BOMB ^7has been planted by ^1%s^7!" % name)
@@ -3015,7 +3521,7 @@ class LogParser(object):
             elif action == 'Bombholder':
                 player.is_bombholder()
 
-    def handle_bomb_exploded(self):
+    def handle_bomb_exploded(self, _):
         """
         handle bomb exploded
         """
@@ -3025,7 +3531,7 @@ class LogParser(object):
             processor = Thread(target=self.kill_blue_team_bomb_exploded)
             processor.setDaemon(True)
             processor.start()
-        self.handle_teams_ts_mode('Red')
+        self.handle_teams_ts_mode(events.LogEvent('SurvivorWinner', 'Red'))
 
     def kill_blue_team_bomb_exploded(self):
         """
@@ -3038,12 +3544,13 @@ class LogParser(object):
                 if player.get_team() == 2 and player.get_alive():
                     self.game.send_rcon("smite %d" % player.get_player_num())
 
-    def handle_teams_ts_mode(self, line):
+    def handle_teams_ts_mode(self, event):
         """
         handle team balance in Team Survivor mode
         """
+        line = event.data
         logger.debug("SurvivorWinner: %s", line)
-        self.game.send_rcon("%s%s ^7team wins" % ('^1' if line == 'Red' else '^4', line) if 'Draw' not in line else "^7Draw")
+        self.game.send_rcon("%s%s ^7team wins" % ('^1' if line == 'Red' else '^4', line) if 'Draw' not in line else "^7Draw", priority=RCON_BROADCAST)
         self.autobalancer()
         if self.ts_do_team_balance:
             self.allow_cmd_teams = True
@@ -3083,23 +3590,19 @@ class LogParser(object):
                     logger.debug("Autobalancer performed team balance")
                 self.ts_do_team_balance = False
 
-    def handle_freeze(self, line):
+    def handle_freeze(self, event):
         """
         handle freeze
         """
         with self.players_lock:
-            info = line.split(":", 1)[0].split()
-            player_num = int(info[0])
-            self.game.players[player_num].freeze()
+            self.game.players[event.player_num].freeze()
 
-    def handle_thawout(self, line):
+    def handle_thawout(self, event):
         """
         handle thaw out
         """
         with self.players_lock:
-            info = line.split(":", 1)[0].split()
-            player_num = int(info[0])
-            self.game.players[player_num].thawout()
+            self.game.players[event.player_num].thawout()
 
     def handle_awards(self):
         """
@@ -3179,9 +3682,9 @@ class LogParser(object):
                 # display personal stats at the end of the round, stats for players in spec will not be displayed
                 if player.get_team() != 3:
                     if self.freeze_gametype:
-                        self.game.rcon_tell(player_num, "^7Stats %s: ^7F ^2%d ^7T ^3%d ^7HS ^1%d ^7TK ^1%d" % (player_name, player.get_freeze(), player.get_thawout(), player.get_headshots(), player.get_team_kill_count()))
+                        self.game.rcon_tell(player_num, "^7Stats %s: ^7F ^2%d ^7T ^3%d ^7HS ^1%d ^7TK ^1%d" % (player_name, player.get_freeze(), player.get_thawout(), player.get_headshots(), player.get_team_kill_count()), priority=RCON_BROADCAST)
                     else:
-                        self.game.rcon_tell(player_num, "^7Stats %s: ^7K ^2%d ^7D ^3%d ^7HS ^1%d ^7TK ^1%d" % (player_name, player_kills, player.get_deaths(), player_headshots, player.get_team_kill_count()))
+                        self.game.rcon_tell(player_num, "^7Stats %s: ^7K ^2%d ^7D ^3%d ^7HS ^1%d ^7TK ^1%d" % (player_name, player_kills, player.get_deaths(), player_headshots, player.get_team_kill_count()), priority=RCON_BROADCAST)
 
             # get Awards
             if most_flags > 1:
@@ -3203,28 +3706,125 @@ class LogParser(object):
 
             # Bomb statistics
             if most_planted > 1 or most_defused > 1:
-                self.game.rcon_say("^2Top Objectives: ^7%s [^1%s^7]" % ((planted_by, most_planted) if most_planted > most_defused else (defused_by, most_defused)))
+                self.game.rcon_say("^2Top Objectives: ^7%s [^1%s^7]" % ((planted_by, most_planted) if most_planted > most_defused else (defused_by, most_defused)), priority=RCON_BROADCAST)
 
             # CTF statistics
             if most_flags > 1:
-                self.game.rcon_say("^2Top Objectives: ^7%s [^1%s^7]" % (flagrunner, most_flags))
+                self.game.rcon_say("^2Top Objectives: ^7%s [^1%s^7]" % (flagrunner, most_flags), priority=RCON_BROADCAST)
 
             # HE grenade kills
             if most_he_kills > 1:
-                self.game.rcon_say("^2Most HE grenade kills: ^7%s (^1%d ^7HE kills)" % (nader, most_he_kills))
+                self.game.rcon_say("^2Most HE grenade kills: ^7%s (^1%d ^7HE kills)" % (nader, most_he_kills), priority=RCON_BROADCAST)
 
             if most_knife_kills > 1:
-                self.game.rcon_say("^2Most knife kills: ^7%s (^1%d ^7kills)" % (knifer, most_knife_kills))
+                self.game.rcon_say("^2Most knife kills: ^7%s (^1%d ^7kills)" % (knifer, most_knife_kills), priority=RCON_BROADCAST)
 
             # CTF statistics
             if fastest_cap < 999:
-                self.game.rcon_say("^2Fastest cap: ^7%s (^1%s ^7sec)" % (fastrunner, fastest_cap))
+                self.game.rcon_say("^2Fastest cap: ^7%s (^1%s ^7sec)" % (fastrunner, fastest_cap), priority=RCON_BROADCAST)
             if most_flag_returns > 1:
-                self.game.rcon_say("^2Best defender: ^7%s (^1%d ^7flag returns)" % (defender, most_flag_returns))
+                self.game.rcon_say("^2Best defender: ^7%s (^1%d ^7flag returns)" % (defender, most_flag_returns), priority=RCON_BROADCAST)
 
             # display Awards
             if msg:
-                self.game.rcon_say("^1AWARDS: %s" % " ^7- ".join(msg))
+                self.game.rcon_say("^1AWARDS: %s" % " ^7- ".join(msg), priority=RCON_BROADCAST)
+
+
+### CLASS Supervisor ###
+class Supervisor(object):
+    """
+    host a log parser and game for each configured game server in a single process
+    """
+    def __init__(self, sections):
+        """
+        create a new instance of Supervisor
+
+        @param sections: The sections of the game servers in the config file
+        @type  sections: List
+        """
+        self.parsers = []
+        # the periodic status queries of all game servers run on the main loop
+        self.rcon_client = AsyncQuake3()
+        for section in sections:
+            logger.info("Game server           : %s", section)
+            parser = LogParser(section, rcon_client=self.rcon_client)
+            if parser.log_source:
+                self.parsers.append(parser)
+
+    def run(self):
+        """
+        follow the games.log files of all game servers
+        """
+        if not self.parsers:
+            logger.error("*** Aborting Spunky Bot ***")
+            return
+        for parser in self.parsers:
+            parser.start()
+        # the database is shared by all game servers
+        schedule.every(2).hours.do(self.parsers[0].remove_expired_db_entries)
+        log_sources = [parser.log_source for parser in self.parsers]
+        while 1:
+            busy = False
+            for parser in self.parsers:
+                if parser.read_log():
+                    busy = True
+            # check the scheduler once per batch of lines
+            schedule.run_pending()
+            self.rcon_client.ready()
+            if not busy:
+                # block until new lines are written, a reply arrives or the next task is due
+                timeout = schedule.idle_seconds()
+                if self.rcon_client.pending:
+                    self.wait(log_sources + [self.rcon_client], min(timeout, self.rcon_client.next_timeout()))
+                else:
+                    self.wait(log_sources, timeout)
+
+    def wait(self, log_sources, timeout):
+        """
+        wait until one of the log sources has new lines or the timeout expired
+
+        @param log_sources: The log sources of the game servers and the RCON client with pending requests
+        @type  log_sources: List
+        @param timeout: Maximum time to wait in seconds
+        @type  timeout: Float
+        """
+        if len(log_sources) == 1:
+            log_sources[0].wait(timeout)
+            return
+        timeout = max(timeout, 0)
+        handles = {}
+        for log_source in log_sources:
+            selectables = log_source.selectables()
+            if selectables is None:
+                # at least one log file must be polled
+                time.sleep(min(timeout, LOG_POLL_DELAY))
+                return
+            for handle in selectables:
+                handles[handle] = log_source
+        try:
+            readable = select.select(handles.keys(), [], [], timeout)[0]
+        except select.error:
+            return
+        for log_source in set(handles[handle] for handle in readable):
+            log_source.ready()
+
+    def kick_banned(self, banned):
+        """
+        kick a banned player from all other game servers
+
+        @param banned: The banned player
+        @type  banned: Instance
+        """
+        for parser in self.parsers:
+            # the game server of the banned player kicks the player itself
+            if parser.game is None or banned in parser.game.players.itervalues():
+                continue
+            with parser.players_lock:
+                for player in parser.game.players.itervalues():
+                    if player.get_player_num() == BOT_PLAYER_NUM:
+                        continue
+                    if player.get_guid() == banned.get_guid() or (player.get_ip_address() == banned.get_ip_address() and player.get_ip_address() != '0.0.0.0'):
+                        parser.kick_player_reason("^7%s ^1banned ^7on another server" % player.get_name(), player.get_player_num())
 
 
 ### CLASS Player ###
@@ -3334,6 +3934,7 @@ class Player(object):
                 # update already existing ban
                 curs.execute("UPDATE `ban_list` SET `ip_address` = '{}',`expires` = '{}',`reason` = '{}' WHERE `guid` = '{}'".format(self.address, expire_date, reason, self.guid))
                 conn.commit()
+                self.apply_ban()
                 return True
             # update IP address of existing ban
             curs.execute("UPDATE `ban_list` SET `ip_address` = '{}' WHERE `guid` = '{}'".format(self.address, self.guid))
@@ -3342,8 +3943,16 @@ class Player(object):
         # create new ban
         curs.execute('INSERT INTO `ban_list` (`id`,`guid`,`name`,`ip_address`,`expires`,`timestamp`,`reason`) VALUES ({},"{}","{}","{}","{}","{}","{}")'.format(self.player_id, self.guid, self.name, self.address, expire_date, timestamp, reason))
         conn.commit()
+        self.apply_ban()
         return True
 
+    def apply_ban(self):
+        """
+        apply the ban immediately on all other game servers of this process
+        """
+        if SUPERVISOR is not None:
+            SUPERVISOR.kick_banned(self)
+
     def add_ban_point(self, point_type, duration):
         try:
             expire_date = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() + duration))
@@ -3850,15 +4459,58 @@ class Player(object):
         return self.thawouts
 
 
+### CLASS RCON Sink ###
+class RconSink(object):
+    """
+    in-memory replacement of PyQuake3 which captures all RCON commands
+    """
+    def __init__(self):
+        """
+        create a new instance of RconSink
+        """
+        self.commands = []
+        self.players = []
+        self.values = {}
+
+    def rcon(self, cmd):
+        """
+        capture RCON command
+        """
+        self.commands.append(cmd)
+        return 'print', ''
+
+    def update(self):
+        """
+        get status
+        """
+        self.values = {}
+
+    def rcon_update(self):
+        """
+        perform RCON status update
+        """
+        self.players = []
+
+
 ### CLASS Game ###
 class Game(object):
     """
     Game class
     """
-    def __init__(self, urt_modversion):
+    def __init__(self, urt_modversion, rcon_sink=None, section='server', rcon_client=None):
         """
         create a new instance of Game
+
+        @param urt_modversion: The UrT modversion
+        @type  urt_modversion: Integer
+        @param rcon_sink: Capture all RCON commands in the given sink instead of sending them to the game server
+        @type  rcon_sink: Instance
+        @param section: The section of the game server in the config file
+        @type  section: String
+        @param rcon_client: Non-blocking client for status queries
+        @type  rcon_client: Instance
         """
+        self.rcon_client = rcon_client
         self.all_maps_list = []
         self.next_mapname = ''
         self.mapname = ''
@@ -3867,11 +4519,33 @@ class Game(object):
         self.players = {}
         self.live = False
         self.urt_modversion = urt_modversion
-        self.quake = PyQuake3("%s:%s" % (CONFIG.get('server', 'server_ip'), CONFIG.get('server', 'server_port')), CONFIG.get('server', 'rcon_password'))
-        self.queue = Queue()
+        self.rcon_sink = rcon_sink
+        self.queue = PriorityQueue()
+        # sequence number of the queued RCON commands, keeps the order within a priority class
+        self.rcon_seq = 0
         self.rcon_lock = RLock()
-        self.thread_rcon()
-        logger.info("Opening RCON socket   : OK")
+        # time of the last RCON command, the commands are paced by RCON_DELAY
+        self.last_rcon = 0
+        # synchronous queries use their own socket and never wait for the queued commands
+        self.query_lock = RLock()
+        self.last_query = 0
+        # load shedding of cosmetic messages if the RCON queue can not be drained in time
+        self.rcon_max_backlog = CONFIG.getint('bot', 'rcon_max_backlog') if CONFIG.has_option('bot', 'rcon_max_backlog') else 20
+        self.rcon_max_age = CONFIG.getfloat('bot', 'rcon_max_age') if CONFIG.has_option('bot', 'rcon_max_age') else 10
+        self.rcon_dropped = 0
+        self.rcon_merged = 0
+        # cached CVAR values and their expiration time by lower case name
+        self.cvar_cache = {}
+        if rcon_sink is None:
+            self.server = "%s:%s" % (CONFIG.get(section, 'server_ip'), CONFIG.get(section, 'server_port'))
+            self.rcon_password = CONFIG.get(section, 'rcon_password')
+            self.quake = PyQuake3(self.server, self.rcon_password)
+            self.query = PyQuake3(self.server, self.rcon_password)
+            self.thread_rcon()
+            logger.info("Opening RCON socket   : OK")
+        else:
+            self.quake = rcon_sink
+            self.query = rcon_sink
 
         # dynamic mapcycle
         self.dynamic_mapcycle = CONFIG.getboolean('mapcycle', 'dynamic_mapcycle') if CONFIG.has_option('mapcycle', 'dynamic_mapcycle') else False
@@ -3884,6 +4558,8 @@ class Game(object):
         spunky_bot = Player(BOT_PLAYER_NUM, '127.0.0.1', 'NONE', 'World')
         self.add_player(spunky_bot)
         logger.info("Activating the Bot    : OK")
+        if rcon_sink is not None:
+            return
         logger.info("Startup completed     : Let's get ready to rumble!")
         logger.info("Spunky Bot is running until you are closing this session or pressing CTRL + C to abort this process.")
         logger.info("*** Note: Use the provided initscript to run Spunky Bot as daemon ***")
@@ -3899,20 +4575,69 @@ class Game(object):
 
     def rcon_process(self):
         """
-        Thread process
+        Thread process, block until a command is queued and send it paced by RCON_DELAY
         """
         while 1:
-            if not self.queue.empty() and self.live:
+            # commands are only queued while live, so block without a timeout
+            priority, _, command, queued, _ = self.queue.get()
+            if priority == RCON_BROADCAST and self.rcon_max_age and time.time() - queued > self.rcon_max_age:
+                # outdated cosmetic message
                 with self.rcon_lock:
-                    try:
-                        command = self.queue.get()
-                        if command != 'status':
-                            self.quake.rcon(command)
-                        else:
-                            self.quake.rcon_update()
-                    except Exception as err:
-                        logger.error(err, exc_info=True)
-            time.sleep(RCON_DELAY)
+                    self.rcon_dropped += 1
+                continue
+            # wait outside of the lock to not block the enqueuing threads
+            self.pace_rcon(self.last_rcon)
+            with self.rcon_lock:
+                command = self.coalesce_rcon(command)
+                try:
+                    if command != 'status':
+                        self.quake.rcon(command)
+                        self.invalidate_cvar(command)
+                    else:
+                        self.quake.rcon_update()
+                except Exception as err:
+                    logger.error(err, exc_info=True)
+                self.last_rcon = time.time()
+
+    def coalesce_rcon(self, command):
+        """
+        append the following queued messages to the given message, separated by ';' up to RCON_MAX_LENGTH characters,
+        call with rcon_lock held
+
+        @param command: The RCON command taken from the queue
+        @type  command: String
+        """
+        if not self.can_coalesce(command):
+            return command
+        with self.queue.mutex:
+            heap = self.queue.queue
+            while heap and self.can_coalesce(heap[0][2]) and len(command) + len(heap[0][2]) < RCON_MAX_LENGTH:
+                priority, _, following, queued, _ = heapq.heappop(heap)
+                if priority == RCON_BROADCAST and self.rcon_max_age and time.time() - queued > self.rcon_max_age:
+                    self.rcon_dropped += 1
+                    continue
+                command = "%s;%s" % (command, following)
+        return command
+
+    def can_coalesce(self, command):
+        """
+        return True if the RCON command is a message which can be combined with other messages
+
+        @param command: The RCON command
+        @type  command: String
+        """
+        return command.split(' ', 1)[0] in RCON_COALESCE_COMMANDS and ';' not in command
+
+    def pace_rcon(self, last_send):
+        """
+        wait until RCON_DELAY has passed since the last RCON command on the same socket
+
+        @param last_send: The time of the last RCON command
+        @type  last_send: Float
+        """
+        delay = last_send + RCON_DELAY - time.time()
+        if delay > 0:
+            time.sleep(delay)
 
     def get_quake_value(self, value):
         """
@@ -3922,9 +4647,9 @@ class Game(object):
         @type  value: String
         """
         if self.live:
-            with self.rcon_lock:
-                self.quake.update()
-                return self.quake.values[value]
+            with self.query_lock:
+                self.query.update()
+                return self.query.values[value]
         return ''
 
     def get_rcon_output(self, value):
@@ -3935,27 +4660,108 @@ class Game(object):
         @type  value: String
         """
         if self.live:
-            with self.rcon_lock:
-                return self.quake.rcon(value)
+            with self.query_lock:
+                self.pace_rcon(self.last_query)
+                try:
+                    return self.query.rcon(value)
+                finally:
+                    self.last_query = time.time()
         return ''
 
+    def get_rcon_status(self):
+        """
+        get the players listed by the RCON command status
+        """
+        with self.query_lock:
+            self.pace_rcon(self.last_query)
+            try:
+                self.query.rcon_update()
+            finally:
+                self.last_query = time.time()
+            return self.query.players or []
+
+    def request_rcon_status(self, callback):
+        """
+        get the players listed by the RCON command status without blocking if a non-blocking client is available
+
+        @param callback: Function which is called with the list of players or None if the server did not respond
+        """
+        if self.rcon_client is None or not self.live:
+            callback(self.get_rcon_status())
+        else:
+            self.rcon_client.rcon_status(self.server, self.rcon_password, callback)
+
     def get_cvar(self, value):
         """
-        get CVAR value
+        get CVAR value, the CVARs listed in CVAR_TTL are cached
 
         @param value: The CVAR value
         @type  value: String
         """
         if self.live:
-            with self.rcon_lock:
+            name = value.lower()
+            with self.query_lock:
+                if name in self.cvar_cache and self.cvar_cache[name][1] > time.time():
+                    return self.cvar_cache[name][0]
+                self.pace_rcon(self.last_query)
                 try:
-                    ret_val = self.quake.rcon(value)[1].split(':', 1)[1].split('^7')[0].lstrip('"')
+                    ret_val = self.query.rcon(value)[1].split(':', 1)[1].split('^7')[0].lstrip('"')
                 except IndexError:
                     ret_val = None
-                time.sleep(RCON_DELAY)
+                finally:
+                    self.last_query = time.time()
+                if ret_val is not None and name in CVAR_TTL:
+                    self.cvar_cache[name] = (ret_val, time.time() + CVAR_TTL[name])
                 return ret_val
         return ''
 
+    def get_cvars(self, names):
+        """
+        get several CVAR values at once, the CVARs which are not cached are queried in parallel
+        return a dict of the CVAR names and values, the value of an unanswered CVAR is None
+
+        @param names: The names of the CVARs
+        @type  names: List
+        """
+        if not self.live:
+            return dict((name, '') for name in names)
+        with self.query_lock:
+            now = time.time()
+            values = dict((name, self.cvar_cache[name.lower()][0]) for name in names if name.lower() in self.cvar_cache and self.cvar_cache[name.lower()][1] > now)
+            missing = [name for name in names if name not in values]
+            if not missing:
+                return values
+            self.pace_rcon(self.last_query)
+            try:
+                values.update(self.query.cvars(missing))
+            except Exception as err:
+                logger.error(err, exc_info=True)
+            finally:
+                self.last_query = time.time()
+            for name in missing:
+                if values.get(name) is not None and name.lower() in CVAR_TTL:
+                    self.cvar_cache[name.lower()] = (values[name], self.last_query + CVAR_TTL[name.lower()])
+                values.setdefault(name)
+            return values
+
+    def invalidate_cvar(self, command):
+        """
+        remove the CVAR which is set by the given RCON command from the cache, exec clears the cache
+
+        @param command: The RCON command, e.g. 'g_gravity 800' or 'set g_gravity 800'
+        @type  command: String
+        """
+        words = command.lower().split()
+        if not words or not self.cvar_cache:
+            return
+        if words[0] == 'exec':
+            self.cvar_cache.clear()
+        elif words[0] in ('set', 'seta', 'sets', 'setu'):
+            if len(words) > 1:
+                self.cvar_cache.pop(words[1], None)
+        else:
+            self.cvar_cache.pop(words[0], None)
+
     def get_number_players(self):
         """
         get the number of online players
@@ -3967,17 +4773,17 @@ class Game(object):
         get the full path of mapcycle.txt file
         """
         maplist = []
-        self.get_cvar('')
+        cvars = self.get_cvars(('fs_homepath', 'fs_basepath', 'fs_game', 'g_mapcycle'))
         # get path of fs_homepath and fs_basepath
-        fs_homepath = self.get_cvar('fs_homepath')
+        fs_homepath = cvars['fs_homepath']
         if not fs_homepath:
             fs_homepath = self.get_cvar('fs_homepath')
         logger.debug("fs_homepath           : %s", fs_homepath)
-        fs_basepath = self.get_cvar('fs_basepath')
+        fs_basepath = cvars['fs_basepath']
         logger.debug("fs_basepath           : %s", fs_basepath)
-        fs_game = self.get_cvar('fs_game')
+        fs_game = cvars['fs_game']
         # get file name of mapcycle.txt
-        mapcycle_file = self.get_cvar('g_mapcycle')
+        mapcycle_file = cvars['g_mapcycle']
         try:
             # set full path of mapcycle.txt
             mc_home_path = os.path.join(fs_homepath, fs_game, mapcycle_file) if fs_homepath else ""
@@ -4001,30 +4807,74 @@ class Game(object):
                 pass
         return maplist
 
-    def send_rcon(self, command):
+    def send_rcon(self, command, priority=None, merge_key=None):
         """
         send RCON command
 
         @param command: The RCON command
         @type  command: String
-        """
-        if self.live:
+        @param priority: The priority class RCON_ENFORCE, RCON_REPLY or RCON_BROADCAST, derived from the command if not given
+        @type  priority: Integer
+        @param merge_key: Replace a queued cosmetic message with the same key instead of dropping it if the queue is backlogged
+        @type  merge_key: Tuple
+        """
+        if priority is None:
+            priority = RCON_ENFORCE if command.split(' ', 1)[0] in RCON_ENFORCE_COMMANDS else RCON_REPLY
+        if self.rcon_sink is not None:
+            self.rcon_sink.rcon(command)
+        elif self.live:
             with self.rcon_lock:
-                self.queue.put(command)
+                if priority == RCON_BROADCAST and self.rcon_max_backlog and self.queue.qsize() >= self.rcon_max_backlog:
+                    self.shed_rcon(command, merge_key)
+                else:
+                    self.rcon_seq += 1
+                    self.queue.put((priority, self.rcon_seq, command, time.time(), merge_key))
+
+    def shed_rcon(self, command, merge_key):
+        """
+        merge a cosmetic message into the queued message with the same merge key or drop it
+
+        @param command: The RCON command
+        @type  command: String
+        @param merge_key: The merge key of the message
+        @type  merge_key: Tuple
+        """
+        if merge_key is not None:
+            with self.queue.mutex:
+                for num, item in enumerate(self.queue.queue):
+                    if item[4] == merge_key:
+                        # same priority and sequence number, the heap order is kept
+                        self.queue.queue[num] = (item[0], item[1], command, time.time(), merge_key)
+                        self.rcon_merged += 1
+                        return
+        self.rcon_dropped += 1
+
+    def get_rcon_stats(self):
+        """
+        return the depth of the RCON queue, the age of the oldest queued command and the number of dropped and merged messages
+        """
+        with self.queue.mutex:
+            queued = [item[3] for item in self.queue.queue]
+        age = time.time() - min(queued) if queued else 0
+        return len(queued), age, self.rcon_dropped, self.rcon_merged
 
-    def rcon_say(self, msg):
+    def rcon_say(self, msg, priority=RCON_REPLY, merge_key=None):
         """
         display message in global chat
 
         @param msg: The message to display in global chat
         @type  msg: String
+        @param priority: The priority class of the message
+        @type  priority: Integer
+        @param merge_key: The merge key of a cosmetic message
+        @type  merge_key: Tuple
         """
         # wrap long messages into shorter list elements
         lines = textwrap.wrap(msg, 140)
         for line in lines:
-            self.send_rcon('say %s' % line)
+            self.send_rcon('say %s' % line, priority, merge_key)
 
-    def rcon_tell(self, player_num, msg, pm_tag=True):
+    def rcon_tell(self, player_num, msg, pm_tag=True, priority=RCON_REPLY, merge_key=None):
         """
         tell message to a specific player
 
@@ -4034,24 +4884,30 @@ class Game(object):
         @type  msg: String
         @param pm_tag: Display '[pm]' (private message) in front of the message
         @type  pm_tag: bool
+        @param priority: The priority class of the message
+        @type  priority: Integer
+        @param merge_key: The merge key of a cosmetic message
+        @type  merge_key: Tuple
         """
         lines = textwrap.wrap(msg, 128)
         prefix = "^4[pm] "
         for line in lines:
             if pm_tag:
-                self.send_rcon('tell %d %s%s' % (player_num, prefix, line))
+                self.send_rcon('tell %d %s%s' % (player_num, prefix, line), priority, merge_key)
                 prefix = ""
             else:
-                self.send_rcon('tell %d %s' % (player_num, line))
+                self.send_rcon('tell %d %s' % (player_num, line), priority, merge_key)
 
-    def rcon_bigtext(self, msg):
+    def rcon_bigtext(self, msg, priority=RCON_BROADCAST):
         """
         display bigtext message
 
         @param msg: The message to display in global chat
         @type  msg: String
+        @param priority: The priority class of the message
+        @type  priority: Integer
         """
-        self.send_rcon('bigtext "%s"' % msg)
+        self.send_rcon('bigtext "%s"' % msg, priority)
 
     def rcon_forceteam(self, player_num, team):
         """
@@ -4068,7 +4924,8 @@ class Game(object):
         """
         clear RCON queue
         """
-        self.queue.queue.clear()
+        with self.queue.mutex:
+            del self.queue.queue[:]
 
     def kick_player(self, player_num, reason=''):
         """
@@ -4080,9 +4937,9 @@ class Game(object):
         @type  reason: String
         """
         if reason and self.urt_modversion > 41:
-            self.send_rcon('kick %d "%s"' % (player_num, reason))
+            self.send_rcon('kick %d "%s"' % (player_num, reason), RCON_ENFORCE)
         else:
-            self.send_rcon('kick %d' % player_num)
+            self.send_rcon('kick %d' % player_num, RCON_ENFORCE)
         logger.debug("%s kicked%s%s", player_num, ": " if reason else '', reason)
 
     def go_live(self):
@@ -4090,6 +4947,7 @@ class Game(object):
         go live
         """
         self.live = True
+        self.get_cvars(('fs_homepath', 'fs_basepath', 'fs_game', 'g_mapcycle', 'g_logsync', 'g_loghits'))
         self.set_all_maps()
         self.maplist = filter(None, self.get_mapcycle_path())
         self.set_current_map()
@@ -4145,17 +5003,10 @@ class Game(object):
         """
         set a list of all available maps
         """
+        if not self.live:
+            return
         try:
-            all_maps = []
-            count = 0
-            while True:
-                ret_val = self.get_rcon_output("dir map bsp")[1].split()
-                if "Directory" in ret_val:
-                    count += 1
-                if count >= 2:
-                    break
-                else:
-                    all_maps += ret_val
+            all_maps = self.get_rcon_output("dir map bsp")[1].split()
             all_maps_list = list(set([maps.replace("/", "").replace(".bsp", "").lower() for maps in all_maps if maps.startswith("/")]))
             all_maps_list.sort()
             if all_maps_list:
@@ -4226,11 +5077,17 @@ if __name__ == "__main__":
     # get full path of spunky.py
     HOME = os.path.dirname(os.path.realpath(__file__))
 
+    # command line options
+    ARG_PARSER = argparse.ArgumentParser(description="Spunky Bot - An automated game server bot and RCON tool for Urban Terror")
+    ARG_PARSER.add_argument('--replay', metavar='FILE', help="feed a recorded games.log file through the parser at maximum speed and exit")
+    ARG_PARSER.add_argument('--database', metavar='FILE', default=os.path.join(HOME, 'data.sqlite'), help="SQLite database file (default: data.sqlite)")
+    ARGS = ARG_PARSER.parse_args()
+
     # load the GEO database and store it globally in interpreter memory
     GEOIP = pygeoip.Database(os.path.join(HOME, 'lib', 'GeoIP.dat'))
 
     # connect to database
-    conn = sqlite3.connect(os.path.join(HOME, 'data.sqlite'))
+    conn = sqlite3.connect(ARGS.database)
     curs = conn.cursor()
     CONFIG = ConfigParser.ConfigParser()
     CONF_PATH = os.path.join(HOME, 'conf', 'settings.conf')
@@ -4261,8 +5118,16 @@ if __name__ == "__main__":
     curs.execute('CREATE TABLE IF NOT EXISTS ban_list (id INTEGER PRIMARY KEY NOT NULL, guid TEXT NOT NULL, name TEXT, ip_address TEXT, expires DATETIME DEFAULT 259200, timestamp DATETIME, reason TEXT)')
     curs.execute('CREATE TABLE IF NOT EXISTS ban_points (id INTEGER PRIMARY KEY NOT NULL, guid TEXT NOT NULL, point_type TEXT, expires DATETIME)')
 
-    # create instance of LogParser
-    LogParser()
+    # game servers, the section [server] and/or several sections [server:NAME]
+    SERVER_SECTIONS = [section for section in CONFIG.sections() if section == 'server' or section.startswith('server:')]
+    SUPERVISOR = None
+    if ARGS.replay:
+        # create instance of LogParser
+        LogParser(SERVER_SECTIONS[0], replay_file=ARGS.replay)
+    else:
+        # create one instance of LogParser and Game per game server
+        SUPERVISOR = Supervisor(SERVER_SECTIONS)
+        SUPERVISOR.run()
 
     # close database connection
     conn.close()
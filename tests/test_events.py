@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import lib.events as events
+
+
+def test_kill_event():
+    event = events.tokenize("  0:05 Kill: 1 0 19: Player1 killed Player0 by UT_MOD_M4")
+    assert isinstance(event, events.KillEvent)
+    assert (event.killer_id, event.victim_id, event.death_cause, event.killer_name) == (1, 0, 19, "Player1")
+
+
+def test_hit_event():
+    event = events.tokenize("  0:05 Hit: 0 1 2 19: Player1 hit Player0 in the Helmet")
+    assert isinstance(event, events.HitEvent)
+    assert (event.victim_id, event.hitter_id, event.hitpoint, event.hit_item) == (0, 1, 2, 19)
+
+
+def test_say_event():
+    event = events.tokenize("  0:06 say: 2 Player 2: !kick Player1 spam")
+    assert isinstance(event, events.SayEvent)
+    assert (event.player_num, event.name, event.command) == (2, "Player 2", "!kick")
+    assert event.text == "!kick Player1 spam"
+    event = events.tokenize("  0:06 say: 2 Player2:")
+    assert (event.player_num, event.command) == (2, '')
+
+
+def test_userinfo_event():
+    event = events.tokenize("  0:00 ClientUserinfo: 12 \\ip\\10.0.0.1:27960\\name\\Player12\\cl_guid\\ABCD")
+    assert isinstance(event, events.UserinfoEvent)
+    assert event.player_num == 12
+    assert event.values is None
+    event.decode()
+    assert event.values == {'ip': '10.0.0.1:27960', 'name': 'Player12', 'cl_guid': 'ABCD'}
+    assert event.changed == event.values
+    changed = events.tokenize("  0:01 ClientUserinfo: 12 \\ip\\10.0.0.1:27960\\name\\Player 12\\cl_guid\\ABCD")
+    changed.decode(event.values)
+    assert changed.changed == {'name': 'Player 12'}
+
+
+def test_explode_line():
+    assert events.explode_line(" \\sv_hostname\\My Server \\g_gametype\\7\\g_gear\n") == {'sv_hostname': 'My Server', 'g_gametype': '7'}
+
+
+def test_bomb_and_generic_events():
+    event = events.tokenize("  2:13 Bomb was planted by 2!")
+    assert (event.action, event.data) == ('Bomb', 'Bomb was planted by 2!')
+    event = events.tokenize("  9:59 Exit: Timelimit hit.")
+    assert type(event) is events.LogEvent
+    assert (event.action, event.data) == ('Exit', 'Timelimit hit.')
+    assert events.tokenize("  9:59 ") is None
+
+
+def test_kill_and_hit_fallback():
+    event = events.tokenize("  0:05 Kill: 1022 0 6: <non-client> killed Player0 by MOD_FALLING")
+    assert (event.killer_id, event.killer_name) == (1022, "<non-client>")
+    event = events.HitEvent('Hit', "0 2048 2 19: Player2048 hit Player0 in the Helmet")
+    assert (event.victim_id, event.hitter_id) == (0, 2048)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import socket
+
+from spunky import LogTail, NetworkLog
+
+
+def test_read_lines_keeps_partial_line(tmpdir):
+    games_log = tmpdir.join('games.log')
+    games_log.write("  0:00 InitGame: \\g_gametype\\7\n  0:01 ClientBegin: 0\n  0:02 Kill: 1 0")
+    log_tail = LogTail(str(games_log))
+    assert log_tail.read_lines() == ["  0:00 InitGame: \\g_gametype\\7", "  0:01 ClientBegin: 0"]
+    assert log_tail.read_lines() == []
+    games_log.write(" 19: Player1 killed Player0 by UT_MOD_M4\n", mode='a')
+    assert log_tail.read_lines() == ["  0:02 Kill: 1 0 19: Player1 killed Player0 by UT_MOD_M4"]
+
+
+def test_reopen_rotated_log(tmpdir):
+    games_log = tmpdir.join('games.log')
+    games_log.write("  0:00 InitGame: \\g_gametype\\7\n")
+    log_tail = LogTail(str(games_log))
+    log_tail.resume()
+    games_log.write("  0:01 ClientBegin: 0\n", mode='a')
+    games_log.rename(tmpdir.join('games.log.1'))
+    tmpdir.join('games.log').write("  0:00 InitGame: \\g_gametype\\4\n")
+    assert log_tail.read_lines() == ["  0:01 ClientBegin: 0"]
+    assert log_tail.read_lines() == ["  0:00 InitGame: \\g_gametype\\4"]
+
+
+def test_truncated_log(tmpdir):
+    games_log = tmpdir.join('games.log')
+    games_log.write("  0:00 InitGame: \\g_gametype\\7\n  0:01 ClientBegin: 0\n")
+    log_tail = LogTail(str(games_log))
+    log_tail.resume()
+    games_log.write("  0:02 Warmup:\n")
+    assert log_tail.read_lines() == ["  0:02 Warmup:"]
+
+
+def test_resume_from_checkpoint(tmpdir):
+    games_log = tmpdir.join('games.log')
+    checkpoint = str(tmpdir.join('games.pos'))
+    games_log.write("  0:00 InitGame: \\g_gametype\\7\n")
+    log_tail = LogTail(str(games_log), checkpoint, checkpoint_interval=2)
+    log_tail.resume()
+    games_log.write("  0:01 ClientBegin: 0\n  0:02 ClientBegin: 1\n", mode='a')
+    log_tail.checkpoint(len(log_tail.read_lines()))
+    games_log.write("  0:03 ClientDisconnect: 0\n", mode='a')
+    # restart after a crash
+    log_tail = LogTail(str(games_log), checkpoint, checkpoint_interval=2)
+    log_tail.resume()
+    assert log_tail.read_lines() == ["  0:03 ClientDisconnect: 0"]
+
+
+def test_find_last_action(tmpdir):
+    games_log = tmpdir.join('games.log')
+    games_log.write("  0:00 InitGame: \\g_gametype\\7\n  0:01 say: 0 Player0: InitGame: \n"
+                    "  0:02 InitGame: \\g_gametype\\4\n  0:03 say: 0 Player0: InitGame: \n")
+    log_tail = LogTail(str(games_log))
+    log_tail.resume()
+    assert log_tail.find_last_action('InitGame:', log_tail.tell()) == "  0:02 InitGame: \\g_gametype\\4"
+    assert log_tail.find_last_action('InitGame:', 60) == "  0:00 InitGame: \\g_gametype\\7"
+    tmpdir.join('empty.log').write("")
+    assert LogTail(str(tmpdir.join('empty.log'))).find_last_action('InitGame:', 0) is None
+
+
+def test_network_log_udp():
+    network_log = NetworkLog('udp://127.0.0.1:0')
+    address = network_log.sock.getsockname()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.sendto("  0:01 ClientBegin: 0\n  0:02 Client", address)
+    network_log.wait(1)
+    assert network_log.read_lines() == ["  0:01 ClientBegin: 0"]
+    sender.sendto("Begin: 1\n", address)
+    network_log.wait(1)
+    assert network_log.read_lines() == ["  0:02 ClientBegin: 1"]
+
+
+def test_network_log_tcp():
+    network_log = NetworkLog('tcp://127.0.0.1:0')
+    sender = socket.create_connection(network_log.sock.getsockname())
+    sender.sendall("  0:01 ClientBegin: 0\r\n")
+    sender.close()
+    lines = []
+    while not lines:
+        network_log.wait(1)
+        lines = network_log.read_lines()
+    assert lines == ["  0:01 ClientBegin: 0"]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import select
+import socket
+import threading
+
+from lib.pyquake3 import PyQuake3
+from lib.asyncquake3 import AsyncQuake3
+
+
+def test_multi_packet_response():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    quake = PyQuake3("127.0.0.1:%d" % server.getsockname()[1], 'secret')
+    quake.send_packet('rcon "secret" dir map bsp')
+    address = server.recvfrom(8192)[1]
+    server.sendto('\xff\xff\xff\xffprint\nDirectory of map\n/ut4_abbey.bsp\n', address)
+    server.sendto('\xff\xff\xff\xffprint\n/ut4_casa.bsp\n', address)
+    server.sendto('\xff\xff\xff\xffprint\n/ut4_turnpike.bsp\n', address)
+    assert quake.parse_packet(quake.recv()) == ('print', 'Directory of map\n/ut4_abbey.bsp\n/ut4_casa.bsp\n/ut4_turnpike.bsp\n')
+
+
+def test_pipelined_cvars():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    quake = PyQuake3("127.0.0.1:%d" % server.getsockname()[1], 'secret')
+
+    def reply_reversed():
+        queries = [server.recvfrom(8192) for _ in xrange(3)]
+        for data, address in reversed(queries):
+            name = data.split()[-1]
+            if name != 'unknown':
+                server.sendto('\xff\xff\xff\xffprint\n"%s" is:"%s^7" default:"^7"\n' % (name.lower(), name.upper()), address)
+
+    responder = threading.Thread(target=reply_reversed)
+    responder.start()
+    values = quake.cvars(['fs_game', 'g_nextCycleMap', 'unknown'], timeout=0.2, retries=1)
+    responder.join()
+    assert values == {'fs_game': 'FS_GAME', 'g_nextCycleMap': 'G_NEXTCYCLEMAP'}
+
+
+def test_async_requests_in_flight():
+    servers = []
+    for _ in xrange(2):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(('127.0.0.1', 0))
+        servers.append(server)
+    client = AsyncQuake3()
+    client.quiet_period = 0.01
+    results = {}
+    client.rcon_status("127.0.0.1:%d" % servers[0].getsockname()[1], 'secret', lambda result: results.update(status=result))
+    client.getstatus("127.0.0.1:%d" % servers[1].getsockname()[1], lambda result: results.update(info=result), timeout=0.05)
+    assert len(client.selectables()) == 2
+    # the second server answers the retransmission only
+    servers[1].recvfrom(8192)
+    data, address = servers[0].recvfrom(8192)
+    assert data == '\xff\xff\xff\xffrcon "secret" status\n'
+    servers[0].sendto('\xff\xff\xff\xffprint\nmap: ut4_abbey\nnum score ping name   lastmsg address qport rate\n'
+                      '--- ----- ---- ------ ------- ------- ----- ----\n', address)
+    servers[0].sendto('\xff\xff\xff\xffprint\n  0    12   48 Player0      0 10.0.0.1:27960 1234 25000\n', address)
+    while 'status' not in results:
+        select.select(client.selectables(), [], [], client.next_timeout())
+        client.ready()
+    assert [(player.num, player.name, player.frags, player.ping, player.address) for player in results['status']] == [(0, 'Player0', 12, 48, '10.0.0.1:27960')]
+    data, address = servers[1].recvfrom(8192)
+    servers[1].sendto('\xff\xff\xff\xffstatusResponse\n\\sv_hostname\\Test\\mapname\\ut4_casa\n', address)
+    while client.pending:
+        select.select(client.selectables(), [], [], client.next_timeout())
+        client.ready()
+    assert results['info'] == {'sv_hostname': 'Test', 'mapname': 'ut4_casa'}